@@ -0,0 +1,167 @@
+"""
+관세청 수출입 현황 수치 추출 성능 측정
+저장해 둔 보도자료 PDF(또는 페이지 텍스트) 묶음으로 항목 추출 속도 집계
+
+측정 항목:
+    extract    pdfplumber 페이지 텍스트 추출 (전체 페이지 vs extract_pdf_values의 필요한 페이지만)
+    match      추출된 텍스트에서 항목 매칭 (결합 정규식 1회 탐색 vs 항목별 개별 탐색), fields/s
+    coverage   페이지별 추출(FieldExtractor.extract)이 전체 텍스트 1회 탐색보다 놓친 항목 (Missed)
+
+사용법:
+    python bench_customs.py customs_pdfs/            # 디렉터리의 *.pdf, *.txt
+    python bench_customs.py a.pdf b.pdf --repeat 50  # 매칭 반복 횟수
+    python bench_customs.py customs_pdfs/ --json out.json
+
+    .txt는 페이지 텍스트를 폼피드(\\f)로 구분한 파일 (pdfplumber 없이 매칭만 측정)
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def _collect(paths):
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(p for p in path.iterdir() if p.suffix.lower() in (".pdf", ".txt"))
+        else:
+            files.append(path)
+    return files
+
+
+def _read_pages(path):
+    """파일 -> (페이지 텍스트 목록, 추출 시간 s)"""
+    started = time.perf_counter()
+    if path.suffix.lower() == ".txt":
+        pages = path.read_text(encoding="utf-8").split("\f")
+    else:
+        import pdfplumber
+
+        with pdfplumber.open(path) as pdf:
+            pages = [page.extract_text() or "" for page in pdf.pages]
+    return pages, time.perf_counter() - started
+
+
+def _lazy_extract(path):
+    """extract_pdf_values (필요한 페이지만) -> (항목 수, 시간 s)"""
+    from customs_monitor import CustomsMonitor
+
+    monitor = CustomsMonitor.__new__(CustomsMonitor)  # HTTP/Slack 없이 추출만
+    started = time.perf_counter()
+    values = monitor.extract_pdf_values(str(path))
+    return len(values), time.perf_counter() - started
+
+
+def _missed_fields(extractor, pages, full):
+    """비교용: 전체 텍스트 탐색에서는 찾았지만 페이지별 추출에서 빠진 항목 이름
+
+    페이지 텍스트는 pdfplumber 페이지처럼 요청할 때만 넘김 (extract가 읽지 않은 페이지는 탐색하지 않음)
+    """
+    from customs_fields import PageTexts
+
+    pdf = SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda text=text: text, close=lambda: None)
+                                 for text in pages])
+    paged = extractor.extract(PageTexts(pdf))
+    return sorted(set(full) - set(paged))
+
+
+def _separate_scan(fields, text):
+    """비교용: 항목마다 개별 정규식으로 전체 텍스트 탐색"""
+    flat = text.replace("\n", " ")
+    values = {}
+    for field, regex in fields:
+        found = [m.groupdict() for _, m in zip(range(field.count), regex.finditer(flat))]
+        if len(found) == field.count:
+            values[field.name] = found
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관세청 수출입 현황 수치 추출 성능 측정")
+    parser.add_argument("paths", nargs="+", help="PDF/텍스트 파일 또는 디렉터리")
+    parser.add_argument("--repeat", type=int, default=20, help="매칭 반복 횟수")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    from customs_fields import EXTRACTOR
+
+    files = _collect(args.paths)
+    if not files:
+        print("측정할 파일 없음")
+        sys.exit(1)
+
+    separate_fields = [(field, re.compile(field.pattern)) for field in EXTRACTOR.fields]
+    repeat = max(1, args.repeat)
+
+    totals = {"files": 0, "pages": 0, "fields": 0, "extract_all_s": 0.0, "extract_lazy_s": 0.0,
+              "lazy_fields": 0, "combined_s": 0.0, "separate_s": 0.0, "missed_fields": 0}
+    missed_by_file = {}
+    print(f"{'File':<40} {'Pages':>5} {'Fields':>6} {'Missed':>6} {'All ms':>8} {'Lazy ms':>8} "
+          f"{'Combined us':>12} {'Separate us':>12}")
+    print("-" * 104)
+    for path in files:
+        pages, extract_s = _read_pages(path)
+        text = "\n".join(page for page in pages if page)
+
+        lazy_s = 0.0
+        lazy_fields = 0
+        if path.suffix.lower() == ".pdf":
+            lazy_fields, lazy_s = _lazy_extract(path)
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            values = EXTRACTOR.scan(text)
+        combined_s = (time.perf_counter() - started) / repeat
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            _separate_scan(separate_fields, text)
+        separate_s = (time.perf_counter() - started) / repeat
+
+        missed = _missed_fields(EXTRACTOR, pages, values)
+        if missed:
+            missed_by_file[path.name] = missed
+
+        totals["files"] += 1
+        totals["pages"] += len(pages)
+        totals["fields"] += len(values)
+        totals["extract_all_s"] += extract_s
+        totals["extract_lazy_s"] += lazy_s
+        totals["lazy_fields"] += lazy_fields
+        totals["combined_s"] += combined_s
+        totals["separate_s"] += separate_s
+        totals["missed_fields"] += len(missed)
+        print(f"{path.name[:40]:<40} {len(pages):>5} {len(values):>6} {len(missed):>6} {extract_s * 1000:>8.1f} "
+              f"{lazy_s * 1000 if lazy_s else '-':>8} {combined_s * 1e6:>12.1f} {separate_s * 1e6:>12.1f}")
+
+    print("-" * 104)
+    fields = totals["fields"]
+    results = dict(
+        totals,
+        missed_by_file=missed_by_file,
+        combined_fields_per_s=round(fields / totals["combined_s"]) if totals["combined_s"] else None,
+        separate_fields_per_s=round(fields / totals["separate_s"]) if totals["separate_s"] else None,
+        end_to_end_fields_per_s=(
+            round(totals["lazy_fields"] / totals["extract_lazy_s"]) if totals["extract_lazy_s"] else None
+        ),
+    )
+    print(f"파일 {totals['files']}개, 페이지 {totals['pages']}개, 항목 {fields}개 (항목 정의 {len(EXTRACTOR.fields)}개)")
+    print(f"매칭 fields/s: 결합 {results['combined_fields_per_s']}, 개별 {results['separate_fields_per_s']}")
+    for name, missed in missed_by_file.items():
+        print(f"페이지별 추출 누락 {name}: {', '.join(missed)}")
+    if totals["extract_lazy_s"]:
+        print(f"PDF 추출: 전체 페이지 {totals['extract_all_s']:.2f}s, 필요한 페이지만 {totals['extract_lazy_s']:.2f}s "
+              f"(end-to-end {results['end_to_end_fields_per_s']} fields/s)")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+진입점별 콜드 스타트 import 비용 측정
+각 모듈을 새 프로세스에서 `python -X importtime`으로 import해 누적 시간 집계
+
+사용법:
+    python bench_imports.py                  # 전체 진입점 측정
+    python bench_imports.py --repeat 5       # 반복 횟수 (중앙값 사용)
+    python bench_imports.py --max-ms 300     # 기준 초과 시 종료코드 1
+    python bench_imports.py --json out.json  # 결과 저장
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ENTRY_POINTS = [
+    "run_check",
+    "run_summary",
+    "run_customs_check",
+    "run_dram_check",
+    "run_oil_check",
+    "run_portfolio_backfill",
+]
+
+# 상위 N개 무거운 모듈 출력
+TOP_MODULES = 5
+
+
+def measure(module):
+    """새 프로세스에서 module import 후 (총 import 시간 ms, {최상위 모듈: ms}) 반환"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import 실패")
+
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 들여쓰기 없는 항목 = 최상위 import
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative) / 1000
+    return sum(top_level.values()), top_level
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진입점별 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+
+    print(f"{'Module':<26} {'Import (ms)':>12}  Heaviest")
+    print("-" * 70)
+    for module in args.modules:
+        try:
+            runs = [measure(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<26} {'ERROR':>12}  {e}")
+            failed = True
+            continue
+
+        total = statistics.median(run[0] for run in runs)
+        heaviest = sorted(runs[-1][1].items(), key=lambda x: x[1], reverse=True)[:TOP_MODULES]
+        results[module] = {"import_ms": round(total, 1), "heaviest": dict(heaviest)}
+
+        heaviest_str = ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest)
+        print(f"{module:<26} {total:>12.1f}  {heaviest_str}")
+
+        if args.max_ms is not None and total > args.max_ms:
+            print(f"  -> 기준 초과 ({args.max_ms:.0f}ms)")
+            failed = True
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
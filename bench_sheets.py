@@ -0,0 +1,237 @@
+"""
+Google Sheet API 호출 예산 측정 (오프라인)
+fake_gspread 인메모리 스프레드시트로 시트 기록 경로를 실행해 호출 수/전송량/모의 지연 집계
+행당 호출 수가 예산을 넘으면 종료코드 1
+
+시나리오:
+    portfolio_daily_cold   빈 시트 + 빈 로컬 미러에 일간 기록 1회
+    portfolio_daily_warm   이력이 있는 시트에 일간 기록 반복 (실행 1회 평균)
+    portfolio_backfill_N   빈 시트에 N거래일 백필
+    run_all_tabs           Portfolio/DRAM/Oil 기록을 공용 세션 1개로 반영
+
+사용법:
+    python bench_sheets.py
+    python bench_sheets.py --latency-ms 150         # 호출당 모의 지연 (합산만)
+    python bench_sheets.py --latency-ms 150 --sleep # 실제 대기
+    python bench_sheets.py --json out.json
+    python bench_sheets.py --verbose                # 시나리오 실행 로그 출력
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# 시나리오별 행당 최대 API 호출 수 (현재 구현 기준, 늘어나면 회귀)
+BUDGETS = {
+    "portfolio_daily_cold": 6.0,
+    "portfolio_daily_warm": 4.0,
+    "portfolio_backfill_20": 0.3,
+    "portfolio_backfill_250": 0.036,
+    "portfolio_backfill_1000": 0.021,
+    "run_all_tabs": 3.0,
+}
+
+BACKFILL_SIZES = (20, 250, 1000)
+
+# 일간 기록 반복 횟수 (warm)
+WARM_DAYS = 20
+
+# 백필 종료일 (고정해 실행마다 같은 구간)
+BACKFILL_END = date(2025, 12, 31)
+
+
+def _weekdays_back(end, count):
+    """end 이전(포함) 평일 count개의 첫 날짜"""
+    day = end
+    found = 0
+    while True:
+        if day.weekday() < 5:
+            found += 1
+            if found == count:
+                return day
+        day -= timedelta(days=1)
+
+
+def _isolate_environment(workdir):
+    """로컬 상태 파일을 임시 디렉터리로, 외부 연동(Slack/인증/원장)은 끔 (모듈 import 전 호출)"""
+    os.environ["STATE_DB_PATH"] = os.path.join(workdir, "state.db")
+    os.environ["SHEET_MIRROR_PATH"] = os.path.join(workdir, "sheet_mirror.db")
+    os.environ["OHLCV_CACHE_PATH"] = os.path.join(workdir, "ohlcv_cache.db")
+    os.environ["PORTFOLIO_ANALYTICS_PATH"] = os.path.join(workdir, "portfolio_analytics.db")
+    os.environ["PORTFOLIO_LEDGER_PATH"] = os.path.join(workdir, "no_ledger.csv")
+    for name in ("SLACK_BOT_TOKEN", "GSHEET_CREDENTIALS"):
+        os.environ.pop(name, None)
+
+
+def _reset_state():
+    """시나리오 간 로컬 미러/백필 체크포인트/분석 상태 초기화"""
+    from portfolio_analytics import ANALYTICS_NAMESPACE, get_analytics_store
+    from portfolio_tracker import BACKFILL_NAMESPACE
+    from sheet_mirror import MIRROR_NAMESPACE, get_mirror_store
+    from state_store import get_state_store
+
+    for store, namespace in (
+        (get_mirror_store(), MIRROR_NAMESPACE),
+        (get_state_store(), BACKFILL_NAMESPACE),
+        (get_analytics_store(), ANALYTICS_NAMESPACE),
+    ):
+        for key in store.items(namespace):
+            store.delete(namespace, key)
+
+
+def _tracker():
+    """pykrx 대신 합성 종가를 쓰는 PortfolioTracker"""
+    import numpy as np
+
+    from portfolio_tracker import STOCK_ORDER, PortfolioTracker
+    from price_matrix import PriceMatrix
+
+    class BenchTracker(PortfolioTracker):
+        def fetch_price_matrix(self, start_date, end_date, strict=False):
+            start = date(int(start_date[:4]), int(start_date[4:6]), int(start_date[6:]))
+            end = date(int(end_date[:4]), int(end_date[4:6]), int(end_date[6:]))
+            days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+            dates = [d.isoformat() for d in days if d.weekday() < 5]
+            ordinals = np.array([date.fromisoformat(d).toordinal() for d in dates], dtype=np.float64)
+            base = np.arange(1, len(STOCK_ORDER) + 1) * 10000.0
+            values = np.round(base[None, :] * (1 + 0.1 * np.sin(ordinals[:, None] / 30.0)))
+            return PriceMatrix(dates, STOCK_ORDER, values)
+
+    return BenchTracker()
+
+
+def _daily(tracker, session, day):
+    date_str = day.isoformat()
+    matrix = tracker.fetch_price_matrix(day.strftime("%Y%m%d"), day.strftime("%Y%m%d"))
+    portfolio_data = tracker.calculate_portfolio(matrix.prices_at(date_str), date_str)
+    tracker.update_google_sheet(date_str, portfolio_data, session=session)
+    session.commit()
+
+
+def scenario_daily_cold(client):
+    from sheet_session import SheetSession
+
+    _daily(_tracker(), SheetSession(client), BACKFILL_END)
+    return 1
+
+
+def scenario_daily_warm(client):
+    from sheet_session import SheetSession
+
+    tracker = _tracker()
+    start = _weekdays_back(BACKFILL_END, 60)
+    tracker.backfill(start.strftime("%Y%m%d"), BACKFILL_END.strftime("%Y%m%d"), session=SheetSession(client))
+
+    # 이력 준비분은 제외하고 일간 기록만 측정
+    client.stats.reset()
+    day = BACKFILL_END
+    for _ in range(WARM_DAYS):
+        day += timedelta(days=1)
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        _daily(tracker, SheetSession(client), day)
+    return WARM_DAYS
+
+
+def scenario_backfill(size):
+    def run(client):
+        from sheet_session import SheetSession
+
+        start = _weekdays_back(BACKFILL_END, size)
+        return _tracker().backfill(
+            start.strftime("%Y%m%d"), BACKFILL_END.strftime("%Y%m%d"), session=SheetSession(client)
+        )
+
+    return run
+
+
+def scenario_run_all_tabs(client):
+    import dram_monitor
+    import oil_monitor
+    import portfolio_tracker
+    from sheet_session import SheetSession
+
+    # 탭 준비 (측정 제외)
+    spreadsheet = client.open_by_key(portfolio_tracker.SPREADSHEET_ID)
+    spreadsheet.add_worksheet(dram_monitor.SHEET_NAME)
+    client.stats.reset()
+
+    session = SheetSession(client)
+    tracker = _tracker()
+    day = date.today()
+    matrix = tracker.fetch_price_matrix(day.strftime("%Y%m%d"), day.strftime("%Y%m%d"))
+    prices = matrix.prices_at(day.isoformat()) or {ticker: 10000 for ticker in portfolio_tracker.STOCK_ORDER}
+    tracker.update_google_sheet(day.isoformat(), tracker.calculate_portfolio(prices), session=session)
+
+    # 시트 기록만 측정 (HTTP 세션은 사용하지 않음)
+    http_unused = object()
+    dram_prices = {item: {"session_avg": "3.100"} for item in dram_monitor.TARGET_ITEMS}
+    dram_monitor.DramMonitor(session=http_unused).update_google_sheet(dram_prices, session=session)
+    oil_prices = {oil_type: {"price": 75.5} for oil_type in oil_monitor.OIL_TYPES}
+    oil_monitor.OilMonitor(session=http_unused).update_google_sheet(oil_prices, session=session)
+
+    session.commit()
+    return 3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Sheet API 호출 예산 측정 (오프라인)")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="호출당 모의 지연 (ms)")
+    parser.add_argument("--sleep", action="store_true", help="모의 지연만큼 실제 대기")
+    parser.add_argument("--json", dest="json_path", default=None)
+    parser.add_argument("--verbose", action="store_true", help="시나리오 실행 로그 출력")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_sheets_")
+    _isolate_environment(workdir)
+
+    from fake_gspread import ApiStats, FakeClient
+
+    scenarios = [
+        ("portfolio_daily_cold", scenario_daily_cold),
+        ("portfolio_daily_warm", scenario_daily_warm),
+    ]
+    scenarios += [(f"portfolio_backfill_{size}", scenario_backfill(size)) for size in BACKFILL_SIZES]
+    scenarios.append(("run_all_tabs", scenario_run_all_tabs))
+
+    results = {}
+    failed = False
+    print(f"{'Scenario':<26} {'Rows':>6} {'Calls':>6} {'Calls/row':>10} {'Budget':>8} "
+          f"{'Sent KB':>8} {'Recv KB':>8} {'Sim s':>7} {'Wall ms':>8}")
+    print("-" * 96)
+    for name, scenario in scenarios:
+        _reset_state()
+        client = FakeClient(ApiStats(latency=args.latency_ms / 1000, sleep=args.sleep))
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO()):
+            rows = scenario(client)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        stats = client.stats
+        per_row = stats.total_calls / rows if rows else float("inf")
+        budget = BUDGETS.get(name)
+        over = budget is not None and per_row > budget + 1e-9
+        failed = failed or over
+
+        results[name] = dict(stats.as_dict(), rows=rows, calls_per_row=round(per_row, 4), budget=budget,
+                             wall_ms=round(wall_ms, 1))
+        print(f"{name:<26} {rows:>6} {stats.total_calls:>6} {per_row:>10.3f} {budget if budget else '-':>8} "
+              f"{stats.bytes_sent / 1024:>8.1f} {stats.bytes_received / 1024:>8.1f} "
+              f"{stats.simulated_seconds:>7.2f} {wall_ms:>8.1f}"
+              + ("  -> 예산 초과" if over else ""))
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
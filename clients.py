@@ -0,0 +1,124 @@
+"""
+모니터 공용 외부 클라이언트
+- Slack WebClient, requests 세션, Google Sheet 클라이언트를 실행 1회당 한 번만 생성
+- Google Sheet 쓰기는 공용 세션에 모았다가 commit_sheets()에서 batchUpdate로 반영
+- 각 클라이언트는 처음 사용할 때 생성 (사용하지 않는 라이브러리는 import 하지 않음)
+- Google Sheet 클라이언트는 프로세스 공용 1개 (인증 정보는 메모리에서 로드, 토큰은 만료 시에만 갱신)
+"""
+
+import json
+import os
+import threading
+
+SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+
+_gsheet_client = None
+_gsheet_lock = threading.Lock()
+
+
+def get_gsheet_client(tag="[GSheet]"):
+    """프로세스 공용 Google Sheet 클라이언트 (최초 호출 시 생성). 인증 정보/라이브러리가 없으면 None
+
+    서비스 계정 JSON은 임시 파일 없이 메모리에서 바로 로드.
+    액세스 토큰은 인증 정보 객체에 보관되어 만료 시에만 갱신되고,
+    모든 시트 작업이 같은 인증 HTTP 세션을 사용.
+    """
+    global _gsheet_client
+    with _gsheet_lock:
+        if _gsheet_client is not None:
+            return _gsheet_client
+
+        try:
+            import gspread
+        except ImportError:
+            print(f"{tag} gspread 미설치 - 시트 업데이트 스킵")
+            return None
+
+        creds_json = os.environ.get("GSHEET_CREDENTIALS")
+        if not creds_json:
+            print(f"{tag} GSHEET_CREDENTIALS 미설정 - 시트 업데이트 스킵")
+            return None
+        try:
+            creds_info = json.loads(creds_json)
+        except ValueError as e:
+            print(f"{tag} GSHEET_CREDENTIALS 형식 오류 - 시트 업데이트 스킵: {e}")
+            return None
+
+        try:
+            _gsheet_client = gspread.service_account_from_dict(creds_info)
+        except Exception as e:  # 필수 키 누락(KeyError), 잘못된 private key(ValueError/MalformedError) 등
+            print(f"{tag} GSHEET_CREDENTIALS 인증 정보 오류 - 시트 업데이트 스킵: {e}")
+            return None
+        return _gsheet_client
+
+
+class SharedClients:
+    """여러 모니터가 함께 쓰는 클라이언트 묶음 (스레드 간 공유)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._built = {}
+
+    def _get(self, name, factory):
+        with self.lock:
+            if name not in self._built:
+                self._built[name] = factory()
+            return self._built[name]
+
+    @property
+    def slack(self):
+        def build():
+            if not SLACK_BOT_TOKEN:
+                return None
+            from slack_sdk import WebClient
+            return WebClient(token=SLACK_BOT_TOKEN)
+
+        return self._get("slack", build)
+
+    @property
+    def session(self):
+        def build():
+            import requests
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            return session
+
+        return self._get("session", build)
+
+    @property
+    def gsheet(self):
+        return self._get("gsheet", get_gsheet_client)
+
+    @property
+    def sheet_session(self):
+        """공용 시트 쓰기 세션. Google Sheet 클라이언트가 없으면 None"""
+        client = self.gsheet
+
+        def build():
+            if client is None:
+                return None
+            from sheet_session import SheetSession
+            return SheetSession(client)
+
+        return self._get("sheet_session", build)
+
+    def commit_sheets(self):
+        """공용 세션에 모인 시트 쓰기 반영 (세션이 없으면 무시). 실패 시 False"""
+        with self.lock:
+            sheet_session = self._built.get("sheet_session")
+        if sheet_session is None:
+            return True
+        return sheet_session.commit()
+
+    def close(self):
+        self.commit_sheets()
+        with self.lock:
+            session = self._built.get("session")
+            if session is not None:
+                session.close()
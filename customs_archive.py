@@ -0,0 +1,231 @@
+"""
+관세청 수출입 현황 과거 보도자료 일괄 수집
+- 게시판(bbsId=1362) 페이지를 끝(또는 시작일 이전)까지 넘기며 '수출입 현황' 게시물 수집
+- 상세 조회 + PDF 다운로드는 동시 실행 수/초당 요청 수 제한 (FetchExecutor: 재시도, 서킷 브레이커)
+- PDF 분석은 프로세스 풀 (pdfplumber 레이아웃 분석은 CPU 연산), 다운로드와 겹쳐 실행
+- 결과는 파싱 캐시(customs_cache)에 저장하고 이미 캐시된 게시물은 네트워크 없이 건너뜀
+- 캐시 전체로 월간/순별(1~10일, 1~20일) 수출/수입/반도체 시계열 CSV 작성
+"""
+
+import csv
+import multiprocessing
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from customs_cache import content_hash
+from customs_fields import PageTexts
+from customs_monitor import ITEM_LABELS, CustomsMonitor, parse_pdf_bytes, summarize
+from fetch_executor import FetchExecutor
+
+# 동시 다운로드 수 / 초당 요청 수 (게시물당 상세 조회 + 다운로드 2건)
+ARCHIVE_WORKERS = int(os.environ.get("CUSTOMS_ARCHIVE_WORKERS", "4"))
+ARCHIVE_RATE = float(os.environ.get("CUSTOMS_ARCHIVE_RATE", "4"))
+
+# PDF 분석 프로세스 수 (기본 CPU 수)
+ARCHIVE_PROCESSES = int(os.environ.get("CUSTOMS_ARCHIVE_PROCESSES", str(os.cpu_count() or 2)))
+
+# 게시판 최대 조회 페이지 수
+ARCHIVE_MAX_PAGES = 500
+
+SERIES_FILE = os.environ.get("CUSTOMS_SERIES_PATH", "customs_series.csv")
+
+# 시계열 구분 정렬 순서
+KIND_ORDER = {"1-10": 0, "1-20": 1, "monthly": 2}
+
+SERIES_COLUMNS = [
+    "period", "kind", "posted", "ntt_sn", "title",
+    "export", "export_yoy", "import", "import_yoy", "balance",
+    "export_annual", "import_annual", "export_annual_yoy", "import_annual_yoy",
+    "semiconductor", "semiconductor_yoy", "semiconductor_share",
+] + [f"{name}{suffix}" for name in ITEM_LABELS for suffix in ("", "_yoy")]
+
+
+def _normalize_date(value):
+    """"2026.03.11" / "2026-03-11" -> "2026-03-11" """
+    return re.sub(r"[./]", "-", value.strip())
+
+
+def parse_period(title):
+    """게시물 제목 -> (기간 "YYYY-MM", 구분). 알 수 없으면 None
+
+    구분: "1-10" / "1-20" (월 중 누계 잠정치), "monthly" (월간)
+    예: "2026년 3월 1일~10일 수출입 현황" -> ("2026-03", "1-10")
+        "2026년 2월 수출입 현황(확정치)" -> ("2026-02", "monthly")
+    """
+    m = re.search(r"(\d{4})\s*년\s*(\d{1,2})\s*월(?:\s*(\d{1,2})\s*일?\s*[~∼-]\s*(\d{1,2})\s*일)?", title)
+    if not m:
+        return None
+    period = f"{m.group(1)}-{int(m.group(2)):02d}"
+    if m.group(4) and int(m.group(4)) < 28:
+        return period, f"{int(m.group(3))}-{int(m.group(4))}"
+    return period, "monthly"
+
+
+class CustomsArchive:
+    def __init__(self, monitor=None, cache=None, executor=None, processes=ARCHIVE_PROCESSES):
+        self.monitor = monitor or CustomsMonitor(cache=cache)
+        self.cache = cache or self.monitor.cache
+        self.executor = executor or FetchExecutor(
+            rate=ARCHIVE_RATE, burst=ARCHIVE_WORKERS, max_workers=ARCHIVE_WORKERS
+        )
+        self.processes = max(1, processes)
+
+    def collect_posts(self, since=None, max_pages=ARCHIVE_MAX_PAGES):
+        """게시판 페이지를 넘기며 '수출입 현황' 게시물 수집 (최신순, ntt_sn 중복 제거)
+
+        Args:
+            since: "YYYY-MM-DD" - 이보다 먼저 등록된 게시물은 제외하고 그 페이지에서 중단
+        """
+        posts = {}
+        for page in range(1, max_pages + 1):
+            page_posts, oldest = self.monitor.fetch_board_page(page)
+            if oldest is None:
+                break
+            for post in page_posts:
+                post["date"] = _normalize_date(post["date"])
+                if since and post["date"] and post["date"] < since:
+                    continue
+                posts.setdefault(post["ntt_sn"], post)
+            print(f"[관세청 아카이브] 게시판 {page}페이지: 누적 {len(posts)}건")
+            if since and oldest and _normalize_date(oldest) < since:
+                break
+        return list(posts.values())
+
+    def _download(self, post):
+        """상세 조회 + PDF 다운로드. (파일명, bytes), 첨부 없음/응답 오류/크기 초과는 None
+
+        요청마다 FetchExecutor로 실행해 전송 오류(예외)만 재시도/서킷 브레이커 대상
+        (None은 다시 요청해도 같은 결과라 재시도하지 않음)
+        """
+        pdf_info = self.executor.call(self.monitor.fetch_post_detail, post["ntt_sn"], post["ntt_sn_url"])
+        if not pdf_info:
+            return None
+        pdf_data = self.executor.call(self.monitor.download_pdf, pdf_info["url"])
+        if not pdf_data:
+            return None
+        return pdf_info["filename"], pdf_data
+
+    def ingest(self, since=None, max_pages=ARCHIVE_MAX_PAGES):
+        """과거 보도자료 다운로드/분석 후 캐시에 저장. 새로 저장한 게시물 수 반환"""
+        posts = self.collect_posts(since, max_pages)
+        cached = self.cache.keys()
+        pending = [post for post in posts if post["ntt_sn"] not in cached]
+        print(f"[관세청 아카이브] 게시물 {len(posts)}건 중 캐시 {len(posts) - len(pending)}건, 신규 {len(pending)}건")
+        if not pending:
+            return 0
+
+        saved = 0
+        skipped = 0
+        failed = 0
+        # 동시에 진행 중인 게시물 수 상한 (다운로드 + 분석 대기). 다운로드가 분석보다 빨라도
+        # 메모리에 쌓이는 PDF bytes는 이 수만큼
+        window = self.executor.max_workers + self.processes
+        queued = iter(pending)
+        # 분석 프로세스는 spawn (다운로드 스레드가 도는 중에 fork하면 잠금 상태가 복제됨)
+        with ThreadPoolExecutor(max_workers=self.executor.max_workers) as downloads, \
+                ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")) as parsers:
+            # {future: (단계, 게시물)} - 다운로드가 끝난 게시물은 바로 분석 단계로
+            in_flight = {}
+            while True:
+                # 분석이 끝나 자리가 난 만큼만 다음 게시물 다운로드 시작
+                while len(in_flight) < window:
+                    post = next(queued, None)
+                    if post is None:
+                        break
+                    in_flight[downloads.submit(self._download, post)] = ("download", post)
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, post = in_flight.pop(future)
+                    if stage == "parse":
+                        try:
+                            values, page_count, texts = future.result()
+                        except Exception as e:
+                            print(f"[관세청 아카이브] 분석 실패: {post['title']}: {e}")
+                            failed += 1
+                            continue
+                        self.cache.put(post["ntt_sn"], post["sha256"], PageTexts(count=page_count, texts=texts),
+                                       values, summarize(values), title=post["title"], date=post["date"],
+                                       filename=post["filename"])
+                        saved += 1
+                        if saved % 10 == 0:
+                            print(f"[관세청 아카이브] 저장 {saved}/{len(pending)}건")
+                        continue
+
+                    # 다운로드 완료 -> 분석 프로세스로 (bytes는 분석 작업이 끝날 때까지 대기열에 남음)
+                    try:
+                        downloaded = future.result()
+                    except Exception as e:
+                        print(f"[관세청 아카이브] 다운로드 실패: {post['title']}: {e}")
+                        failed += 1
+                        continue
+                    if downloaded is None:
+                        print(f"[관세청 아카이브] PDF 첨부 없음 또는 다운로드 불가, 건너뜀: {post['title']}")
+                        skipped += 1
+                        continue
+                    filename, pdf_data = downloaded
+                    parsed = dict(post, filename=filename, sha256=content_hash(pdf_data))
+                    in_flight[parsers.submit(parse_pdf_bytes, pdf_data)] = ("parse", parsed)
+
+        print(f"[관세청 아카이브] 저장 {saved}건, 건너뜀 {skipped}건, 실패 {failed}건")
+        return saved
+
+    def series(self):
+        """캐시 전체 -> 기간/구분별 시계열 행 (같은 기간/구분은 마지막 등록 게시물, 예: 확정치)
+
+        금액은 억 달러, 증감률/비중은 %. 무역수지 적자는 음수
+        """
+        rows = {}
+        for ntt_sn, entry in self.cache.items().items():
+            period = parse_period(entry.get("title") or "")
+            if period is None:
+                continue
+            values = self.monitor.cached_values(ntt_sn, entry)
+            row = _series_row(values)
+            row.update(period=period[0], kind=period[1], posted=_normalize_date(entry.get("date") or ""), ntt_sn=ntt_sn,
+                       title=entry.get("title") or "")
+            previous = rows.get(period)
+            if previous is None or (row["posted"], row["ntt_sn"]) > (previous["posted"], previous["ntt_sn"]):
+                rows[period] = row
+        return sorted(rows.values(), key=lambda row: (row["period"], KIND_ORDER.get(row["kind"], 9)))
+
+    def write_series(self, path=SERIES_FILE):
+        """시계열 CSV 저장. 행 수 반환"""
+        rows = self.series()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SERIES_COLUMNS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({column: row.get(column, "") for column in SERIES_COLUMNS})
+        print(f"[관세청 아카이브] 시계열 {len(rows)}행 -> {path}")
+        return len(rows)
+
+
+def _series_row(values):
+    """추출 값 (customs_fields) -> 시계열 열"""
+    row = {}
+    for name in ("export", "import"):
+        if name in values:
+            row[name] = values[name]["amount"]
+            row[f"{name}_yoy"] = values[name]["yoy"]
+        table = values.get(f"{name}_table")
+        if table:
+            row[f"{name}_annual"] = table["annual"]
+    if "balance" in values:
+        balance = values["balance"]
+        row["balance"] = -balance["amount"] if balance["kind"] == "적자" else balance["amount"]
+    if "annual_yoy" in values:
+        row["export_annual_yoy"] = values["annual_yoy"][0]["rate"]
+        row["import_annual_yoy"] = values["annual_yoy"][1]["rate"]
+    if "semiconductor" in values:
+        row["semiconductor"] = values["semiconductor"]["amount"]
+        row["semiconductor_yoy"] = values["semiconductor"]["yoy"]
+    if "semiconductor_share" in values:
+        row["semiconductor_share"] = values["semiconductor_share"]["share"]
+    for name in ITEM_LABELS:
+        if name in values:
+            row[name] = values[name]["amount"]
+            row[f"{name}_yoy"] = values[name]["yoy"]
+    return row
@@ -0,0 +1,92 @@
+"""
+관세청 보도자료 파싱 결과 캐시
+- 게시물(ntt_sn)별 PDF 내용 해시(sha256), 추출 값, summary, 페이지별 텍스트 보관 (전용 SQLite 파일)
+- 같은 게시물을 다시 처리할 때 PDF 내용이 같으면 pdfplumber 분석 생략
+- 페이지 텍스트가 남아 있어 항목 정의를 고친 뒤에도 네트워크/PDF 분석 없이 과거 보도자료 재추출
+  (PDF 분석 때 추출한 페이지만 보관. 추출하지 않은 페이지에 있는 새 항목은 재추출로 찾을 수 없음)
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from state_store import StateStore
+
+CUSTOMS_CACHE_FILE = os.environ.get("CUSTOMS_CACHE_PATH", "customs_cache.db")
+
+# key: ntt_sn
+RELEASE_NAMESPACE = "customs_release"
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ReleaseCache:
+    def __init__(self, store=None):
+        self.store = store or get_release_store()
+
+    def get(self, ntt_sn, digest=None):
+        """캐시 항목 (digest를 주면 PDF 해시가 같을 때만). 없으면 None
+
+        Returns:
+            {"sha256", "fields_version", "page_count", "pages": {"페이지 인덱스": 텍스트},
+             "values", "summary", "title", "date", "filename", "parsed_at"}
+        """
+        entry = self.store.get(RELEASE_NAMESPACE, ntt_sn)
+        if entry is None or (digest is not None and entry["sha256"] != digest):
+            return None
+        return entry
+
+    def put(self, ntt_sn, digest, pages, values, summary, title=None, date=None, filename=None):
+        """
+        Args:
+            pages: PageTexts (추출된 페이지 텍스트 저장)
+        """
+        from customs_fields import EXTRACTOR
+
+        self.store.set(RELEASE_NAMESPACE, ntt_sn, {
+            "sha256": digest,
+            "fields_version": EXTRACTOR.version,
+            "page_count": pages.count,
+            "pages": {str(index): text for index, text in sorted(pages.texts.items())},
+            "values": values,
+            "summary": summary,
+            "title": title,
+            "date": date,
+            "filename": filename,
+            "parsed_at": time.time(),
+        })
+
+    def update_values(self, ntt_sn, entry, values, summary):
+        """재추출 결과 반영 (페이지 텍스트/해시는 유지)"""
+        from customs_fields import EXTRACTOR
+
+        entry = dict(entry, values=values, summary=summary, fields_version=EXTRACTOR.version)
+        self.store.set(RELEASE_NAMESPACE, ntt_sn, entry)
+
+    def page_texts(self, entry):
+        """{페이지 인덱스(int): 텍스트}"""
+        return {int(index): text for index, text in entry["pages"].items()}
+
+    def keys(self):
+        """캐시된 ntt_sn 집합 (페이지 텍스트를 읽지 않음)"""
+        return self.store.keys(RELEASE_NAMESPACE)
+
+    def items(self):
+        """{ntt_sn: 캐시 항목}"""
+        return self.store.items(RELEASE_NAMESPACE)
+
+
+_release_store = None
+_release_lock = threading.Lock()
+
+
+def get_release_store():
+    """파싱 결과 전용 저장소 (페이지 텍스트가 커서 실행 상태 DB와 분리)"""
+    global _release_store
+    with _release_lock:
+        if _release_store is None:
+            _release_store = StateStore(CUSTOMS_CACHE_FILE)
+        return _release_store
@@ -0,0 +1,304 @@
+"""
+관세청 수출입 현황 PDF 수치 추출 규칙
+- 항목별 선언 (이름, 패턴, 우선 페이지, 값 후처리)을 import 시 하나의 정규식으로 컴파일
+- 텍스트를 한 번만 훑어 모든 항목을 동시에 매칭 (항목이 늘어도 텍스트 탐색은 1회)
+- 항목 추가는 FIELDS에 한 줄 (품목/국가 표 행은 table_row)
+
+패턴 작성 규칙:
+    - 값은 이름 있는 그룹 (?P<이름>...)으로 캡처, 후처리는 convert={그룹: 변환 함수}
+    - 텍스트는 줄바꿈을 공백으로 바꾼 뒤 매칭 (여러 줄에 걸친 문장도 한 줄처럼)
+    - 같은 위치에서 시작하는 항목이 여럿 매칭되면 먼저 선언한 항목만 인정되므로
+      항목마다 서로 다른 머리말(표 행 이름, 문장 주어)로 시작하도록 작성
+"""
+
+import hashlib
+import re
+
+
+def number(text):
+    """"1,234.5" -> 1234.5"""
+    return float(text.replace(",", ""))
+
+
+def signed(text):
+    """증감률 "△1.5" -> -1.5 (△는 감소)"""
+    text = text.strip()
+    if text.startswith("△"):
+        return -number(text[1:].strip())
+    return number(text)
+
+
+def hundred_millions(text):
+    """표 금액 (백만 달러) -> 억 달러"""
+    return number(text) / 100
+
+
+def change(text):
+    """"12.3% 증가" -> 12.3, "4.5% 감소" -> -4.5"""
+    rate = number(re.match(r"[\d,.]+", text).group())
+    return -rate if text.endswith("감소") else rate
+
+
+class Field:
+    def __init__(self, name, pattern, pages=(0,), convert=None, count=1, required=True):
+        """
+        Args:
+            name: 항목 이름 (결과 key)
+            pattern: 정규식 (값은 이름 있는 그룹)
+            pages: 우선 탐색 페이지 (0부터, 음수는 끝에서부터)
+            convert: {그룹 이름: 변환 함수} (없는 그룹은 문자열 그대로)
+            count: 앞에서부터 모을 매칭 수 (같은 형식 행이 순서대로 나오는 경우, 예: 수출/수입 증감률)
+            required: False면 보도자료에 없을 수 있는 항목 (우선 페이지에서만 찾고, 없다고 다른 페이지를 더 읽지 않음)
+        """
+        self.name = name
+        self.pattern = pattern
+        self.pages = tuple(pages)
+        self.convert = convert or {}
+        self.count = count
+        self.required = required
+        self.groups = re.compile(pattern).groupindex.keys()
+
+    def values(self, match, prefix):
+        """결합 정규식 매칭 -> {그룹 이름: 변환 값}"""
+        result = {}
+        for group in self.groups:
+            raw = match.group(prefix + group)
+            if raw is None:
+                continue
+            convert = self.convert.get(group)
+            result[group] = convert(raw) if convert else raw
+        return result
+
+
+def spaced(label):
+    """표 행 이름 "반도체" -> 글자 사이 공백 허용 패턴 (PDF 표 셀은 "반 도 체"처럼 추출됨)"""
+    return r"\s*".join(re.escape(char) for char in label)
+
+
+def table_row(name, label, pages, required=False):
+    """품목/국가별 표 행: 이름 다음 금액(백만 달러), 전년동기대비 증감률"""
+    return Field(
+        name,
+        spaced(label) + r"\s+(?P<amount>[\d,]+)\s+(?P<yoy>△?\s?[\d.]+)",
+        pages=pages,
+        convert={"amount": hundred_millions, "yoy": signed},
+        required=required,
+    )
+
+
+# 수출/수입 표 행 열 순서: 전년 당월, 전년 연간누계, 전월, 당월, 연간누계 (백만 달러)
+_TRADE_COLUMNS = r"\s+(?P<last_year>[\d,]+)\s+(?P<last_year_annual>[\d,]+)\s+(?P<prev>[\d,]+)\s+(?P<cur>[\d,]+)\s+(?P<annual>[\d,]+)"
+_TRADE_CONVERT = {key: hundred_millions for key in ("last_year", "last_year_annual", "prev", "cur", "annual")}
+
+# 증감률 행: 마지막 열이 연간누계
+_RATE = r"\(\s*△?\s?[\d.]+\s*\)\s*"
+
+FIELDS = (
+    # 1페이지 요약 문장
+    Field(
+        "export",
+        r"수출은?\s*(?P<amount>[\d,.]+)억 달러.*?(?P<yoy>\d+\.\d+%\s*(?:증가|감소))",
+        convert={"amount": number, "yoy": change},
+    ),
+    Field(
+        "import",
+        r"수입은?\s*(?P<amount>[\d,.]+)억?\s*달러.*?(?P<yoy>\d+\.\d+%\s*(?:증가|감소))",
+        convert={"amount": number, "yoy": change},
+    ),
+    Field(
+        "balance",
+        r"무역수지는?\s*(?P<amount>[\d,.]+)억 달러\s*(?P<kind>흑자|적자)",
+        convert={"amount": number},
+    ),
+    Field(
+        "semiconductor_share",
+        r"반도체 수출 비중은?\s*(?P<share>[\d.]+)%",
+        convert={"share": number},
+        required=False,
+    ),
+    # 수출/수입 표
+    Field("export_table", spaced("수출") + _TRADE_COLUMNS, pages=(0, 1), convert=_TRADE_CONVERT),
+    Field("import_table", spaced("수입") + _TRADE_COLUMNS, pages=(0, 1), convert=_TRADE_CONVERT),
+    Field(
+        "annual_yoy",
+        r"\(전년동기대비증감률\)\s*" + _RATE * 4 + r"\(\s*(?P<rate>△?\s?[\d.]+)\s*\)",
+        pages=(0, 1),
+        convert={"rate": signed},
+        count=2,  # 수출, 수입 순
+    ),
+    # 붙임 품목별/국가별 수출 표 (붙임이 없는 보도자료도 있어 선택 항목)
+    table_row("semiconductor", "반도체", pages=(1, 2)),
+    table_row("car", "승용차", pages=(1, 2)),
+    table_row("ship", "선박", pages=(1, 2)),
+    table_row("china", "중국", pages=(1, 2, 3)),
+    table_row("usa", "미국", pages=(1, 2, 3)),
+    table_row("vietnam", "베트남", pages=(1, 2, 3)),
+)
+
+
+def _split_first(pattern):
+    """패턴 -> (반드시 시작하는 글자, 나머지 패턴). 첫 글자가 리터럴이 아니면 None"""
+    if pattern[:1] == "\\" and len(pattern) > 1 and not pattern[1].isalnum():
+        first, rest = pattern[1], pattern[2:]
+    elif pattern[:1] and pattern[0] not in ".^$*+?{}[]|()\\":
+        first, rest = pattern[0], pattern[1:]
+    else:
+        return None
+    if rest[:1] and rest[0] in "*+?{":
+        return None
+    return first, rest
+
+
+def _converter_id(fn):
+    """값 후처리 함수 식별자: 모듈.이름 + 함수 본문(바이트코드/상수) 해시 (본문만 고쳐도 바뀜)"""
+    name = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        return name
+    body = hashlib.sha1(code.co_code + repr(code.co_consts).encode("utf-8")).hexdigest()[:8]
+    return f"{name}:{body}"
+
+
+class FieldExtractor:
+    """FIELDS 전체를 하나의 정규식으로 결합해 한 번에 매칭"""
+
+    def __init__(self, fields=FIELDS):
+        self.fields = list(fields)
+        self.by_name = {field.name: field for field in self.fields}
+        self.required = [field.name for field in self.fields if field.required]
+        # 항목 정의 식별자 (저장된 추출 값이 현재 정의로 만든 것인지 확인용, 값 후처리 함수 포함)
+        spec = "\n".join(
+            f"{field.name}\t{field.pattern}\t{field.count}\t{field.required}\t"
+            + ",".join(f"{group}={_converter_id(fn)}" for group, fn in sorted(field.convert.items()))
+            for field in self.fields
+        )
+        self.version = hashlib.sha1(spec.encode("utf-8")).hexdigest()[:12]
+
+        # 항목마다 전방탐색으로 감싸 매칭 위치를 소비하지 않음 (항목끼리 겹쳐도 각각 매칭)
+        # 내부 그룹 이름은 항목 인덱스 접두사로 구분: f{i} (항목 전체), f{i}_{그룹}
+        patterns = [re.sub(r"\(\?P<(\w+)>", rf"(?P<f{i}_\1>", field.pattern) for i, field in enumerate(self.fields)]
+        splits = [_split_first(pattern) for pattern in patterns]
+
+        if all(splits):
+            # 모든 항목 첫 글자 집합 1글자를 소비하며 훑고 (정규식 엔진의 글자 집합 고속 탐색),
+            # 그 위치에서만 항목별 나머지 패턴 시도
+            firsts = "".join(re.escape(first) for first in dict.fromkeys(first for first, _ in splits))
+            branches = [
+                rf"(?<={re.escape(first)})(?=(?P<f{i}>{rest}))" for i, (first, rest) in enumerate(splits)
+            ]
+            self.regex = re.compile(f"[{firsts}](?:{'|'.join(branches)})")
+        else:
+            branches = [rf"(?=(?P<f{i}>{pattern}))" for i, pattern in enumerate(patterns)]
+            self.regex = re.compile("|".join(branches))
+
+    def scan(self, text):
+        """텍스트 1회 탐색.
+
+        Returns:
+            {항목 이름: {그룹: 값}} (count > 1 항목은 [{그룹: 값}, ...], count개를 다 찾은 경우만)
+        """
+        flat = text.replace("\n", " ")
+        matches = {}
+        remaining = len(self.fields)
+        for m in self.regex.finditer(flat):
+            i = int(m.lastgroup[1:])
+            field = self.fields[i]
+            found = matches.setdefault(field.name, [])
+            if len(found) >= field.count:
+                continue
+            found.append(field.values(m, f"f{i}_"))
+            if len(found) == field.count:
+                remaining -= 1
+                if not remaining:
+                    break
+
+        values = {}
+        for name, found in matches.items():
+            field = self.by_name[name]
+            if len(found) < field.count:
+                continue
+            values[name] = found[0] if field.count == 1 else found
+        return values
+
+    def extract(self, pages):
+        """페이지별 텍스트에서 항목 추출 (필요한 페이지만 텍스트 요청)
+
+        1. 항목별 우선 페이지 (Field.pages) 전체, 모든 항목을 찾으면 중단
+        2. 필수 항목이 빠졌으면 나머지 페이지를 앞에서부터, 필수 항목을 모두 찾으면 중단
+           (그 사이 읽은 페이지의 선택 항목도 함께 반영)
+        3. 그래도 필수 항목이 빠졌으면 전체 텍스트로 (페이지 경계에 걸친 경우)
+
+        선택 항목(required=False)만 빠진 보도자료는 우선 페이지만 읽고 끝남
+
+        Args:
+            pages: PageTexts
+        """
+        values = {}
+        hinted = self.hinted_pages(pages.count)
+        for index in hinted:
+            _merge(values, self.scan(pages.get(index)))
+            if len(values) == len(self.fields):
+                return values
+        if self.has_required(values):
+            return values
+
+        for index in range(pages.count):
+            if index in hinted:
+                continue
+            _merge(values, self.scan(pages.get(index)))
+            if self.has_required(values):
+                return values
+
+        _merge(values, self.scan(pages.joined()))
+        return values
+
+    def has_required(self, values):
+        return all(name in values for name in self.required)
+
+    def hinted_pages(self, page_count):
+        """모든 항목의 우선 페이지 (실제 인덱스, 오름차순)"""
+        indexes = set()
+        for field in self.fields:
+            indexes |= {index % page_count for index in field.pages if -page_count <= index < page_count}
+        return sorted(indexes)
+
+
+class PageTexts:
+    """페이지 텍스트 지연 추출 (페이지당 1회)
+
+    pdf 없이 저장된 텍스트만으로 만들면 (재추출) 없는 페이지는 빈 텍스트
+    """
+
+    def __init__(self, pdf=None, count=None, texts=None):
+        """
+        Args:
+            pdf: pdfplumber PDF
+            count: 전체 페이지 수 (pdf가 있으면 생략)
+            texts: 이미 추출된 {페이지 인덱스: 텍스트}
+        """
+        self.pdf = pdf
+        self.count = len(pdf.pages) if pdf is not None else count
+        self.texts = dict(texts or {})
+
+    def get(self, index):
+        if index not in self.texts:
+            if self.pdf is None:
+                return ""
+            page = self.pdf.pages[index]
+            self.texts[index] = page.extract_text() or ""
+            page.close()  # 페이지 레이아웃 캐시 해제 (큰 첨부파일 메모리)
+        return self.texts[index]
+
+    def joined(self):
+        """전체 페이지 텍스트 (원문 순서, 빈 페이지 제외)"""
+        return "\n".join(text for text in (self.get(index) for index in range(self.count)) if text)
+
+
+def _merge(values, found):
+    """먼저 찾은 값 유지"""
+    for name, value in found.items():
+        values.setdefault(name, value)
+
+
+# 기본 FIELDS 추출기 (import 시 1회 컴파일)
+EXTRACTOR = FieldExtractor()
@@ -4,22 +4,22 @@
 PDF 첨부파일에서 수출입 핵심 수치 추출
 """
 
+import io
 import os
 import re
 import time
-import tempfile
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import pdfplumber
-from bs4 import BeautifulSoup
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 
+CUSTOMS_ORIGIN = "https://www.customs.go.kr"
 BOARD_URL = "https://www.customs.go.kr/kcs/na/ntt/selectNttList.do"
 DETAIL_URL = "https://www.customs.go.kr/kcs/na/ntt/selectNttInfo.do"
 BOARD_PARAMS = {"mi": "2891", "bbsId": "1362"}
 
+# 첨부 PDF 최대 크기 (바이트). 넘으면 다운로드 중단
+PDF_MAX_BYTES = int(os.environ.get("CUSTOMS_PDF_MAX_BYTES", str(30 * 1024 * 1024)))
+
+# 다운로드 청크 크기 (바이트)
+PDF_CHUNK_BYTES = 64 * 1024
+
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_CHANNEL = os.environ.get("SLACK_CHANNEL", "#stock_management")
 
@@ -28,23 +28,122 @@ HEADERS = {
     "Accept-Language": "ko-KR,ko;q=0.9",
 }
 
+# 주요 품목/국가 수출 (customs_fields 항목 이름: 표시 이름)
+ITEM_LABELS = {
+    "car": "승용차",
+    "ship": "선박",
+    "china": "중국",
+    "usa": "미국",
+    "vietnam": "베트남",
+}
+
+
+def _amount(value):
+    return f"{value:g}억 달러"
+
+
+def summarize(values):
+    """추출 값 (customs_fields 항목별) -> Slack 메시지용 summary dict"""
+    summary = {}
+    if "export" in values:
+        export = values["export"]
+        summary["당월_수출"] = f"{_amount(export['amount'])} (전년동기대비 {export['yoy']:+.1f}%)"
+    if "import" in values:
+        imports = values["import"]
+        summary["당월_수입"] = f"{_amount(imports['amount'])} (전년동기대비 {imports['yoy']:+.1f}%)"
+    if "balance" in values:
+        summary["무역수지"] = f"{_amount(values['balance']['amount'])} {values['balance']['kind']}"
+
+    for name, key in (("export_table", "수출"), ("import_table", "수입")):
+        if name in values:
+            table = values[name]
+            summary[f"전월_{key}"] = f"{table['prev']:.1f}억 달러"
+            summary[f"전월대비_{key}"] = f"{(table['cur'] - table['prev']) / table['prev'] * 100:+.1f}%"
+            summary[f"연간누계_{key}"] = f"{table['annual']:.1f}억 달러"
+
+    if "annual_yoy" in values:
+        export_rate, import_rate = values["annual_yoy"]
+        summary["연간누계_수출_증감률"] = f"{export_rate['rate']:+.1f}%"
+        summary["연간누계_수입_증감률"] = f"{import_rate['rate']:+.1f}%"
+
+    if "semiconductor" in values:
+        semi = values["semiconductor"]
+        summary["반도체_수출"] = f"{semi['amount']:.1f}억 달러 ({semi['yoy']:+.1f}%)"
+    if "semiconductor_share" in values:
+        summary["반도체_비중"] = f"{values['semiconductor_share']['share']:g}%"
+
+    for name, label in ITEM_LABELS.items():
+        if name in values:
+            item = values[name]
+            summary[f"{label}_수출"] = f"{item['amount']:.1f}억 달러 ({item['yoy']:+.1f}%)"
+    return summary
+
+
+def parse_pdf(pdf):
+    """PDF bytes 또는 파일 경로 -> (추출 값, PageTexts)"""
+    import pdfplumber
+
+    from customs_fields import EXTRACTOR, PageTexts
+
+    source = io.BytesIO(pdf) if isinstance(pdf, (bytes, bytearray)) else pdf
+    with pdfplumber.open(source) as document:
+        pages = PageTexts(document)
+        values = EXTRACTOR.extract(pages)
+    return values, pages
+
+
+def parse_pdf_bytes(pdf_data):
+    """프로세스 풀 작업용 (pdfplumber 객체는 넘길 수 없음): PDF bytes -> (추출 값, 페이지 수, {페이지 인덱스: 텍스트})"""
+    values, pages = parse_pdf(pdf_data)
+    return values, pages.count, pages.texts
+
 
 class CustomsMonitor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+    def __init__(self, slack_client=None, session=None, cache=None):
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers.update(HEADERS)
+        self.session = session
+        # 관세청 서버 오류 재시도 (공유 세션이면 관세청 도메인에만 적용)
         retry = Retry(total=3, backoff_factor=5, status_forcelist=[500, 502, 503])
-        self.session.mount("https://", HTTPAdapter(max_retries=retry))
-        self.slack_client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
+        self.session.mount(CUSTOMS_ORIGIN, HTTPAdapter(max_retries=retry))
+        self.slack_client = slack_client
+        if self.slack_client is None and SLACK_BOT_TOKEN:
+            from slack_sdk import WebClient
+            self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
         self.seen_posts = {}  # {ntt_sn: title}
+        if cache is None:
+            from customs_cache import ReleaseCache
+
+            cache = ReleaseCache()
+        self.cache = cache  # 파싱 결과 캐시 (ntt_sn + PDF 해시)
 
     def fetch_board_list(self):
-        """게시판 목록에서 '정보데이터' + '수출입 현황' 게시물 추출"""
-        resp = self.session.get(BOARD_URL, params=BOARD_PARAMS, timeout=15)
+        """게시판 목록(첫 페이지)에서 '정보데이터' + '수출입 현황' 게시물 추출"""
+        return self.fetch_board_page(1)[0]
+
+    def fetch_board_page(self, page):
+        """게시판 목록 page 페이지 조회.
+
+        Returns:
+            ('정보데이터' + '수출입 현황' 게시물 목록, 페이지 전체 게시물 중 가장 이른 등록일 "YYYY-MM-DD")
+            게시물이 없는 페이지(마지막 페이지 다음)면 등록일은 None
+        """
+        from bs4 import BeautifulSoup
+
+        params = dict(BOARD_PARAMS, currPage=str(page)) if page > 1 else BOARD_PARAMS
+        resp = self.session.get(BOARD_URL, params=params, timeout=15)
         resp.encoding = "utf-8"
 
         soup = BeautifulSoup(resp.text, "html.parser")
         posts = []
+        rows = 0
+        dates = []
 
         for link in soup.find_all("a", class_="nttInfoBtn"):
             row = link.find_parent("tr")
@@ -54,12 +153,15 @@ class CustomsMonitor:
             cells = row.find_all("td")
             if len(cells) < 3:
                 continue
+            rows += 1
 
             category = cells[1].get_text(strip=True)
             title = link.get_text(strip=True).replace("새글", "")
             ntt_sn = link.get("data-id", "")
             ntt_sn_url = link.get("data-url", "")
             date = cells[-2].get_text(strip=True) if len(cells) >= 5 else ""
+            if date:
+                dates.append(date)
 
             if "정보데이터" in category and "수출입 현황" in title:
                 posts.append({
@@ -69,10 +171,14 @@ class CustomsMonitor:
                     "date": date,
                 })
 
-        return posts
+        if not rows:
+            return posts, None
+        return posts, min(dates) if dates else ""
 
     def fetch_post_detail(self, ntt_sn, ntt_sn_url):
         """게시물 상세 페이지에서 PDF 다운로드 URL 추출"""
+        from bs4 import BeautifulSoup
+
         self.session.get(BOARD_URL, params=BOARD_PARAMS, timeout=15)
 
         form_data = {
@@ -100,7 +206,7 @@ class CustomsMonitor:
             text = a_tag.get_text(strip=True)
             if "nttFileDownload" in href and ".pdf" in text.lower():
                 pdf_info = {
-                    "url": "https://www.customs.go.kr" + href,
+                    "url": CUSTOMS_ORIGIN + href,
                     "filename": re.sub(r"\s*\[.*", "", text).strip(),
                 }
                 break
@@ -108,90 +214,79 @@ class CustomsMonitor:
         return pdf_info
 
     def download_pdf(self, pdf_url):
-        """PDF 파일 다운로드 후 임시 파일 경로 반환"""
-        resp = self.session.get(pdf_url, timeout=30)
-        if resp.status_code != 200:
-            print(f"[오류] PDF 다운로드 실패: {resp.status_code}")
-            return None
-
-        tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-        tmp.write(resp.content)
-        tmp.close()
-        return tmp.name
-
-    def extract_pdf_summary(self, pdf_path):
-        """PDF에서 당월 수출 실적, 연간누계 실적, 반도체 수출 실적 추출"""
-        texts = []
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    texts.append(text)
-
-        full_text = "\n".join(texts)
-        summary = {}
-
-        # 1. 당월 수출/수입/무역수지 (페이지 1 요약 표)
-        # "수출 435억 달러" 패턴
-        m = re.search(r"수출은?\s*([\d,.]+)억 달러.*?(\d+\.\d+)%\s*증가", full_text.replace("\n", " "))
-        if m:
-            summary["당월_수출"] = f"{m.group(1)}억 달러 (전년동기대비 +{m.group(2)}%)"
-
-        m = re.search(r"수입은?\s*([\d,.]+)억?\s*달러.*?(\d+\.\d+)%\s*증가", full_text.replace("\n", " "))
-        if m:
-            summary["당월_수입"] = f"{m.group(1)}억 달러 (전년동기대비 +{m.group(2)}%)"
-
-        m = re.search(r"무역수지는?\s*([\d,.]+)억 달러\s*(흑자|적자)", full_text.replace("\n", " "))
-        if m:
-            summary["무역수지"] = f"{m.group(1)}억 달러 {m.group(2)}"
-
-        # 2. 표에서 전월/당월/연간누계 추출
-        # 열 순서: 2025당월, 2025연간누계, 2026전월, 2026당월, 2026연간누계
-        m = re.search(
-            r"수\s*출\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)",
-            full_text,
-        )
-        if m:
-            export_prev = int(m.group(3).replace(",", ""))
-            export_cur = int(m.group(4).replace(",", ""))
-            export_annual = int(m.group(5).replace(",", ""))
-            mom_rate = (export_cur - export_prev) / export_prev * 100
-            summary["전월_수출"] = f"{export_prev/100:.1f}억 달러"
-            summary["전월대비_수출"] = f"{mom_rate:+.1f}%"
-            summary["연간누계_수출"] = f"{export_annual/100:.1f}억 달러"
-
-        m = re.search(
-            r"수\s*입\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)",
-            full_text,
-        )
-        if m:
-            import_prev = int(m.group(3).replace(",", ""))
-            import_cur = int(m.group(4).replace(",", ""))
-            import_annual = int(m.group(5).replace(",", ""))
-            mom_rate = (import_cur - import_prev) / import_prev * 100
-            summary["전월_수입"] = f"{import_prev/100:.1f}억 달러"
-            summary["전월대비_수입"] = f"{mom_rate:+.1f}%"
-            summary["연간누계_수입"] = f"{import_annual/100:.1f}억 달러"
-
-        # 연간누계 증감률
-        rates = re.findall(r"\(전년동기대비증감률\)\s*\([\d.△]+\)\s*\([\d.△]+\)\s*\([\d.△]+\)\s*\([\d.△]+\)\s*\(([\d.△]+)\)", full_text)
-        if len(rates) >= 2:
-            summary["연간누계_수출_증감률"] = f"+{rates[0]}%"
-            summary["연간누계_수입_증감률"] = f"+{rates[1]}%"
-
-        # 3. 반도체 수출 실적 (붙임 표)
-        m = re.search(r"반\s*도\s*체\s+([\d,]+)\s+([\d.△]+)", full_text)
-        if m:
-            semi_amount = int(m.group(1).replace(",", ""))
-            semi_rate = m.group(2)
-            summary["반도체_수출"] = f"{semi_amount/100:.1f}억 달러 (+{semi_rate}%)"
-
-        # 반도체 수출 비중
-        m = re.search(r"반도체 수출 비중은?\s*([\d.]+)%", full_text)
-        if m:
-            summary["반도체_비중"] = f"{m.group(1)}%"
-
-        return summary
+        """PDF 파일을 메모리로 다운로드해 bytes 반환 (실패/크기 초과 시 None)
+
+        디스크에 쓰지 않고 같은 bytes를 수치 추출과 Slack 업로드에 그대로 사용
+        """
+        with self.session.get(pdf_url, timeout=30, stream=True) as resp:
+            if resp.status_code != 200:
+                print(f"[오류] PDF 다운로드 실패: {resp.status_code}")
+                return None
+
+            length = int(resp.headers.get("Content-Length") or 0)
+            if length > PDF_MAX_BYTES:
+                print(f"[오류] PDF 크기 초과: {length:,} bytes (최대 {PDF_MAX_BYTES:,})")
+                return None
+
+            chunks = []
+            size = 0
+            for chunk in resp.iter_content(chunk_size=PDF_CHUNK_BYTES):
+                size += len(chunk)
+                if size > PDF_MAX_BYTES:
+                    print(f"[오류] PDF 크기 초과: {size:,} bytes 이상 (최대 {PDF_MAX_BYTES:,})")
+                    return None
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def extract_pdf_summary(self, pdf):
+        """PDF에서 당월 수출 실적, 연간누계 실적, 반도체 수출 실적 추출
+
+        필요한 페이지만 텍스트 추출 (레이아웃 분석이 PDF 처리 비용 대부분, FieldExtractor.extract 참고)
+        """
+        return summarize(self.extract_pdf_values(pdf))
+
+    def extract_pdf_values(self, pdf):
+        """PDF -> {항목 이름: {그룹: 값}} (customs_fields 추출 값, 금액은 억 달러)
+
+        Args:
+            pdf: PDF bytes (download_pdf 결과) 또는 파일 경로
+        """
+        return parse_pdf(pdf)[0]
+
+    def parse_release(self, post, pdf_data, pdf_filename=None):
+        """게시물 PDF -> summary. 같은 게시물/같은 내용(해시)의 캐시가 있으면 PDF 분석 생략"""
+        from customs_cache import content_hash
+
+        digest = content_hash(pdf_data)
+        entry = self.cache.get(post["ntt_sn"], digest)
+        if entry:
+            print(f"  [PDF] 캐시 사용 (sha256 {digest[:12]})")
+            return summarize(self.cached_values(post["ntt_sn"], entry))
+
+        print(f"  [PDF] 수치 추출 중... ({len(pdf_data):,} bytes)")
+        values, pages = parse_pdf(pdf_data)
+        self.cache.put(post["ntt_sn"], digest, pages, values, summarize(values),
+                       title=post.get("title"), date=post.get("date"), filename=pdf_filename)
+        return summarize(values)
+
+    def cached_values(self, ntt_sn, entry):
+        """캐시 항목의 추출 값 (항목 정의가 바뀌었으면 저장된 페이지 텍스트로 다시 추출)"""
+        from customs_fields import EXTRACTOR, PageTexts
+
+        if entry["fields_version"] == EXTRACTOR.version:
+            return entry["values"]
+
+        pages = PageTexts(count=entry["page_count"], texts=self.cache.page_texts(entry))
+        values = EXTRACTOR.extract(pages)
+        self.cache.update_values(ntt_sn, entry, values, summarize(values))
+        return values
+
+    def reextract_cached(self):
+        """캐시된 전체 보도자료를 현재 항목 정의로 다시 추출 (네트워크/PDF 분석 없음). {ntt_sn: summary}"""
+        return {
+            ntt_sn: summarize(self.cached_values(ntt_sn, entry))
+            for ntt_sn, entry in self.cache.items().items()
+        }
 
     def format_slack_message(self, title, date, summary):
         """Slack 메시지 포맷팅"""
@@ -236,6 +331,12 @@ class CustomsMonitor:
         if "반도체_비중" in summary:
             lines.append(f"  수출 비중: {summary['반도체_비중']}")
 
+        items = [f"{label} {summary[f'{label}_수출']}" for label in ITEM_LABELS.values() if f"{label}_수출" in summary]
+        if items:
+            lines.append("")
+            lines.append("*🚢 주요 품목/국가 수출*")
+            lines.extend(f"  {item}" for item in items)
+
         lines.append("━━━━━━━━━━━━━━━━━━━━")
         lines.append(f"🔗 <https://www.customs.go.kr/kcs/na/ntt/selectNttList.do?mi=2891&bbsId=1362|관세청 보도자료 바로가기>")
 
@@ -243,6 +344,8 @@ class CustomsMonitor:
 
     def _resolve_channel_id(self):
         """채널 이름으로 채널 ID 조회 (chat_postMessage 활용)"""
+        from slack_sdk.errors import SlackApiError
+
         try:
             resp = self.slack_client.chat_postMessage(channel=SLACK_CHANNEL, text=".")
             channel_id = resp["channel"]
@@ -251,18 +354,20 @@ class CustomsMonitor:
         except SlackApiError:
             return None
 
-    def send_slack_alert(self, title, date, summary, pdf_path=None, pdf_filename=None):
-        """Slack 알림 발송 (PDF 첨부 포함)"""
+    def send_slack_alert(self, title, date, summary, pdf_data=None, pdf_filename=None):
+        """Slack 알림 발송 (PDF 첨부 포함, pdf_data는 download_pdf의 bytes)"""
         message = self.format_slack_message(title, date, summary)
 
         if self.slack_client:
+            from slack_sdk.errors import SlackApiError
+
             try:
-                if pdf_path and pdf_filename:
+                if pdf_data and pdf_filename:
                     channel_id = self._resolve_channel_id()
                     if channel_id:
                         self.slack_client.files_upload_v2(
                             channel=channel_id,
-                            file=pdf_path,
+                            file=pdf_data,
                             filename=pdf_filename,
                             initial_comment=message,
                         )
@@ -299,27 +404,29 @@ class CustomsMonitor:
             print(f"  [신규] {post['title']} - 상세 조회 중...")
             pdf_info = self.fetch_post_detail(ntt_sn, post["ntt_sn_url"])
 
-            pdf_path = None
+            pdf_data = None
             pdf_filename = None
             summary = {}
 
             if pdf_info:
                 print(f"  [PDF] 다운로드 중: {pdf_info['filename']}")
-                pdf_path = self.download_pdf(pdf_info["url"])
+                pdf_data = self.download_pdf(pdf_info["url"])
                 pdf_filename = pdf_info["filename"]
 
-                if pdf_path:
-                    print(f"  [PDF] 수치 추출 중...")
-                    summary = self.extract_pdf_summary(pdf_path)
+                if pdf_data:
+                    summary = self.parse_release(post, pdf_data, pdf_filename)
 
             if not summary:
-                summary = {"당월_수출": "데이터 추출 실패 - 첨부파일 확인 필요"}
+                # 상세 조회/다운로드 실패 시 이전 실행에서 파싱해 둔 결과 사용 (첨부 없이)
+                entry = self.cache.get(ntt_sn)
+                if entry:
+                    print("  [PDF] 다운로드 실패 - 캐시된 추출 결과 사용")
+                    summary = summarize(self.cached_values(ntt_sn, entry))
 
-            self.send_slack_alert(post["title"], post["date"], summary, pdf_path, pdf_filename)
+            if not summary:
+                summary = {"당월_수출": "데이터 추출 실패 - 첨부파일 확인 필요"}
 
-            # 임시 파일 정리
-            if pdf_path:
-                os.unlink(pdf_path)
+            self.send_slack_alert(post["title"], post["date"], summary, pdf_data, pdf_filename)
 
             self.seen_posts[ntt_sn] = post["title"]
             new_count += 1
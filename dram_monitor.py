@@ -7,10 +7,9 @@ Google Sheet 업데이트 + Slack 알림
 import os
 import re
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+
+from sheet_mirror import SheetMirror
+from sheet_session import open_session
 
 DRAM_URL = "https://www.dramexchange.com/"
 
@@ -38,16 +37,25 @@ SHEET_NAME = "DRAM"
 
 
 class DramMonitor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-        self.slack_client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
+    def __init__(self, slack_client=None, session=None):
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers.update(HEADERS)
+        self.session = session
+        self.slack_client = slack_client
+        if self.slack_client is None and SLACK_BOT_TOKEN:
+            from slack_sdk import WebClient
+            self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
 
     def fetch_prices(self):
         """DRAMeXchange에서 대상 모델 Session Average 가격 추출"""
         resp = self.session.get(DRAM_URL, timeout=15)
         resp.encoding = "utf-8"
 
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(resp.text, "html.parser")
         prices = {}
         seen = set()
@@ -81,70 +89,58 @@ class DramMonitor:
 
         return prices
 
-    def _get_gsheet_client(self):
-        """Google Sheet 클라이언트 생성"""
-        try:
-            import gspread
-            creds_json = os.environ.get("GSHEET_CREDENTIALS")
-            if creds_json:
-                import json
-                import tempfile
-                creds_path = tempfile.NamedTemporaryFile(
-                    suffix=".json", delete=False, mode="w"
-                )
-                creds_path.write(creds_json)
-                creds_path.close()
-                client = gspread.service_account(filename=creds_path.name)
-                os.unlink(creds_path.name)
-                return client
-            else:
-                print("[GSheet] GSHEET_CREDENTIALS 미설정 - 시트 업데이트 스킵")
-                return None
-        except ImportError:
-            print("[GSheet] gspread 미설치 - 시트 업데이트 스킵")
-            return None
-
-    def update_google_sheet(self, prices, gsheet_client=None):
-        """Google Sheet에 가격 기록 + 전일대비 변동률 계산. 변동률 dict 반환"""
+    def _open_session(self):
+        """단독 실행용 시트 쓰기 세션 생성"""
+        return open_session("[GSheet]")
+
+    def update_google_sheet(self, prices, session=None):
+        """Google Sheet에 가격 기록 + 전일대비 변동률 계산. 변동률 dict 반환
+
+        Args:
+            session: 공유 시트 쓰기 세션 (반영은 호출자가 commit). 없으면 새로 만들어 바로 반영
+        """
         changes = {}
 
-        if not gsheet_client:
-            gsheet_client = self._get_gsheet_client()
-            if not gsheet_client:
+        own_session = session is None
+        if own_session:
+            session = self._open_session()
+            if session is None:
                 return changes
 
         try:
-            sheet = gsheet_client.open_by_key(SPREADSHEET_ID).worksheet(SHEET_NAME)
+            sheet = session.worksheet(SPREADSHEET_ID, SHEET_NAME, create=False)
         except Exception as e:
             print(f"[GSheet 오류] 시트 열기 실패: {e}")
             return changes
+        if sheet is None:
+            print(f"[GSheet 오류] 시트 열기 실패: '{SHEET_NAME}' 시트탭 없음")
+            return changes
 
         today = datetime.now().strftime("%Y-%m-%d")
 
-        # 헤더 확인/생성
-        try:
-            all_values = sheet.get_all_values()
-        except Exception:
-            all_values = []
+        # 헤더 확인/생성 (로컬 미러 증분 동기화)
+        mirror = SheetMirror(sheet, SPREADSHEET_ID)
+        all_values = mirror.sync()
 
         if not all_values:
             headers = ["Date"]
             for item in TARGET_ITEMS:
                 headers.extend([item, f"{item} Change"])
-            sheet.append_row(headers)
-            all_values = [headers]
+            session.append(sheet, [headers])
+            mirror.record_append([headers])
+            all_values = mirror.rows
 
-        # 중복 날짜 체크
-        existing_dates = [row[0] for row in all_values[1:]]
-        if today in existing_dates:
+        # 중복 날짜 체크 (날짜 인덱스 조회)
+        existing = mirror.find(today)
+        if existing is not None:
             print(f"[GSheet] {today} 데이터 이미 존재 - 스킵")
             # 기존 데이터에서 변동률 읽기
-            for row in all_values[1:]:
-                if row[0] == today:
-                    for i, item in enumerate(TARGET_ITEMS):
-                        col = 1 + i * 2 + 1  # Change 컬럼
-                        if col < len(row) and row[col]:
-                            changes[item] = row[col]
+            for i, item in enumerate(TARGET_ITEMS):
+                col = 1 + i * 2 + 1  # Change 컬럼
+                if col < len(existing) and existing[col]:
+                    changes[item] = existing[col]
+            if own_session:
+                session.commit()  # 헤더 추가분 반영
             return changes
 
         # 전일 가격 가져오기 (마지막 데이터 행)
@@ -173,7 +169,10 @@ class DramMonitor:
                 pass
             row.extend([price_str, change])
 
-        sheet.append_row(row)
+        session.append(sheet, [row])
+        mirror.record_append([row])
+        if own_session:
+            session.commit()
         print(f"[GSheet] {today} 가격 업데이트 완료")
         return changes
 
@@ -202,6 +201,8 @@ class DramMonitor:
         message = "\n".join(lines)
 
         if self.slack_client:
+            from slack_sdk.errors import SlackApiError
+
             try:
                 self.slack_client.chat_postMessage(
                     channel=SLACK_CHANNEL,
@@ -213,7 +214,7 @@ class DramMonitor:
         else:
             print(message.replace("*", ""))
 
-    def run(self, gsheet_client=None):
+    def run(self, session=None):
         """가격 조회 → Google Sheet 업데이트 → Slack 알림"""
         print("[DRAM] 가격 조회 중...")
         prices = self.fetch_prices()
@@ -226,5 +227,5 @@ class DramMonitor:
         for item, data in prices.items():
             print(f"  {item}: ${data['session_avg']}")
 
-        changes = self.update_google_sheet(prices, gsheet_client)
+        changes = self.update_google_sheet(prices, session)
         self.send_slack_alert(prices, changes)
@@ -0,0 +1,234 @@
+"""
+오프라인 gspread 대체 (인메모리 스프레드시트)
+- 이 저장소가 쓰는 Client / Spreadsheet / Worksheet 메서드만 구현 (bench_sheets.py 등 오프라인 측정용)
+  구현하지 않은 범위 형식/요청은 AssertionError (호출 이름 포함)
+- 메서드 1회 = Sheets API 호출 1회로 보고 호출 수, 요청/응답 바이트, 모의 지연 시간 집계 (ApiStats)
+- 조회 결과는 실제 API처럼 표시 문자열 (숫자 서식 "#,##0" 적용, 행 끝 빈 칸 제거)
+"""
+
+import json
+import re
+import time
+from collections import Counter
+
+
+class ApiStats:
+    def __init__(self, latency=0.0, sleep=False):
+        """
+        Args:
+            latency: 호출당 모의 지연 (초)
+            sleep: True면 실제로 latency만큼 대기 (False면 시간만 합산)
+        """
+        self.latency = latency
+        self.sleep = sleep
+        self.reset()
+
+    def reset(self):
+        self.calls = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.simulated_seconds = 0.0
+
+    def record(self, method, request=None, response=None):
+        self.calls[method] += 1
+        self.bytes_sent += _size(request)
+        self.bytes_received += _size(response)
+        self.simulated_seconds += self.latency
+        if self.sleep and self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def as_dict(self):
+        return {
+            "calls": self.total_calls,
+            "by_method": dict(self.calls),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "simulated_seconds": round(self.simulated_seconds, 3),
+        }
+
+
+def _size(payload):
+    if payload is None:
+        return 0
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _display(cell):
+    """저장된 (값, 서식) -> 조회 시 표시 문자열"""
+    value, fmt = cell
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        pattern = ((fmt or {}).get("numberFormat") or {}).get("pattern")
+        if pattern == "#,##0":
+            return f"{value:,.0f}"
+        return str(int(value)) if float(value).is_integer() else str(value)
+    return str(value)
+
+
+def _from_api_cell(cell):
+    """appendCells 셀 -> (값, 서식)"""
+    entered = cell.get("userEnteredValue") or {}
+    value = None
+    for key in ("numberValue", "stringValue", "boolValue"):
+        if key in entered:
+            value = entered[key]
+    return value, cell.get("userEnteredFormat")
+
+
+def _column_index(letters):
+    """"A" -> 1, "Z" -> 26, "AA" -> 27"""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def _parse_range(range_name, call):
+    """A1 범위 -> (시작 행, 끝 행 또는 None, 시작 열, 끝 열 또는 None) (1부터)
+
+    지원 형식: "A1", "B2:D", "A5:Z", "A1:C10" (시트 이름 접두사 없이)
+    """
+    match = re.fullmatch(r"([A-Z]+)(\d+)(?::([A-Z]+)(\d+)?)?", range_name)
+    assert match, f"fake_gspread {call}: 지원하지 않는 범위 {range_name!r}"
+    start_col, start_row, end_col, end_row = match.groups()
+    if end_col is None:
+        return int(start_row), int(start_row), _column_index(start_col), _column_index(start_col)
+    return int(start_row), int(end_row) if end_row else None, _column_index(start_col), _column_index(end_col)
+
+
+class WorksheetNotFound(Exception):
+    pass
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, sheet_id, rows=1000, cols=26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self.cells = []  # 행별 [(값, 서식)]
+
+    @property
+    def stats(self):
+        return self.spreadsheet.stats
+
+    def _values(self, start=1, end=None, first_col=1, last_col=None):
+        values = []
+        for row in self.cells[start - 1:end]:
+            shown = [_display(cell) for cell in row[first_col - 1:last_col]]
+            while shown and shown[-1] == "":
+                shown.pop()
+            values.append(shown)
+        return values
+
+    def get_all_values(self):
+        values = self._values()
+        self.stats.record("values.get", {"range": self.title}, values)
+        return values
+
+    def get(self, range_name):
+        """A1 범위 조회 (끝 행을 생략하면 마지막 행까지, 범위 끝의 빈 행은 제외)"""
+        start, end, first_col, last_col = _parse_range(range_name, "Worksheet.get")
+        values = self._values(start, end, first_col, last_col)
+        while values and not values[-1]:
+            values.pop()
+        self.stats.record("values.get", {"range": range_name}, values)
+        return values
+
+    def update(self, values, range_name="A1", **kwargs):
+        """values.update: 범위 왼쪽 위 칸부터 값 덮어쓰기 (서식은 지움, 값 입력 방식은 무시)"""
+        start, _, first_col, _ = _parse_range(range_name, "Worksheet.update")
+        for offset, row in enumerate(values):
+            index = start - 1 + offset
+            while len(self.cells) <= index:
+                self.cells.append([])
+            cells = self.cells[index]
+            if len(cells) < first_col - 1 + len(row):
+                cells.extend([(None, None)] * (first_col - 1 + len(row) - len(cells)))
+            cells[first_col - 1:first_col - 1 + len(row)] = [(value, None) for value in row]
+        self.stats.record("values.update", {"range": range_name, "values": values})
+        return {"updatedRange": range_name}
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values, **kwargs):
+        self.cells.extend([(value, None) for value in row] for row in values)
+        self.stats.record("values.append", values)
+
+    def insert_row(self, values, index=1, **kwargs):
+        self.cells.insert(index - 1, [(value, None) for value in values])
+        self.stats.record("batchUpdate", values)
+
+    def clear(self):
+        self.cells = []
+        self.stats.record("values.clear", {"range": self.title})
+
+    def format(self, ranges, fmt):
+        self.stats.record("batchUpdate", {"range": ranges, "format": fmt})
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id, stats):
+        self.id = spreadsheet_id
+        self.stats = stats
+        self.sheets = []
+        self.next_sheet_id = 1
+
+    def _find(self, title):
+        for sheet in self.sheets:
+            if sheet.title == title:
+                return sheet
+        return None
+
+    def worksheets(self):
+        self.stats.record("get", None, [sheet.title for sheet in self.sheets])
+        return list(self.sheets)
+
+    def worksheet(self, title):
+        self.stats.record("get", None, [sheet.title for sheet in self.sheets])
+        sheet = self._find(title)
+        if sheet is None:
+            raise WorksheetNotFound(title)
+        return sheet
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        sheet = FakeWorksheet(self, title, self.next_sheet_id, rows, cols)
+        self.next_sheet_id += 1
+        self.sheets.append(sheet)
+        self.stats.record("batchUpdate", {"addSheet": title})
+        return sheet
+
+    def batch_update(self, body):
+        """appendCells 요청만 지원"""
+        by_id = {sheet.id: sheet for sheet in self.sheets}
+        for request in body.get("requests", []):
+            assert "appendCells" in request, f"fake_gspread Spreadsheet.batch_update: 지원하지 않는 요청 {list(request)}"
+            append = request["appendCells"]
+            sheet = by_id[append["sheetId"]]
+            sheet.cells.extend(
+                [_from_api_cell(cell) for cell in row.get("values", [])] for row in append["rows"]
+            )
+        self.stats.record("batchUpdate", body, {"replies": [{}] * len(body.get("requests", []))})
+        return {}
+
+
+class FakeClient:
+    def __init__(self, stats=None):
+        self.stats = stats or ApiStats()
+        self.spreadsheets = {}
+
+    def open_by_key(self, key):
+        """없는 ID면 빈 스프레드시트 생성"""
+        if key not in self.spreadsheets:
+            self.spreadsheets[key] = FakeSpreadsheet(key, self.stats)
+        self.stats.record("get", {"spreadsheetId": key})
+        return self.spreadsheets[key]
@@ -0,0 +1,168 @@
+"""
+pykrx 등 외부 시세 조회용 실행기
+- 스레드 풀로 종목별 조회 병렬 실행
+- 토큰 버킷으로 초당 요청 수 제한
+- 요청 단위 재시도 (지수 백오프)
+- 연속 실패 시 서킷 브레이커로 일정 시간 요청 차단
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 초당 최대 요청 수 / 순간 허용 요청 수
+PYKRX_RATE = float(os.environ.get("PYKRX_RATE", "2"))
+PYKRX_BURST = int(os.environ.get("PYKRX_BURST", "4"))
+
+# 동시 조회 스레드 수
+PYKRX_WORKERS = int(os.environ.get("PYKRX_WORKERS", "4"))
+
+# 요청당 재시도 횟수 / 첫 재시도 대기 (초, 이후 2배씩 증가)
+FETCH_RETRIES = 2
+FETCH_BACKOFF = 1.0
+
+# 연속 실패 N회 시 차단, 차단 유지 시간 (초)
+BREAKER_FAILURES = 5
+BREAKER_RESET = 60
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커 차단 중 요청"""
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        """
+        Args:
+            rate: 초당 토큰 보충 수 (0보다 커야 함, 예: PYKRX_RATE / CUSTOMS_ARCHIVE_RATE)
+        """
+        if not rate > 0:
+            raise ValueError(f"초당 요청 수는 0보다 커야 함: {rate}")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 확보까지 대기"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """closed -> (연속 실패) -> open -> (대기 후) half-open -> 성공 시 closed"""
+
+    def __init__(self, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # half-open: 시험 요청 1건만 허용
+            if self.trial_running:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                print(f"[Fetch] 연속 {self.failures}회 실패 - {self.reset_timeout}초간 요청 차단")
+                self.opened_at = time.monotonic()
+                self.trial_running = False
+
+
+class FetchExecutor:
+    def __init__(
+        self,
+        rate=PYKRX_RATE,
+        burst=PYKRX_BURST,
+        max_workers=PYKRX_WORKERS,
+        retries=FETCH_RETRIES,
+        backoff=FETCH_BACKOFF,
+        breaker=None,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+    def call(self, fn, *args, **kwargs):
+        """외부 요청 1건 실행 (속도 제한 + 재시도 + 서킷 브레이커)"""
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError("연속 실패로 요청 차단 중")
+
+            self.bucket.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                print(f"[Fetch] 재시도 {attempt + 1}/{self.retries} ({delay:.1f}초 후): {e}")
+                time.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+
+    def map(self, fn, items):
+        """항목별 fn(item)을 스레드 풀에서 병렬 실행.
+
+        Returns:
+            {item: 결과}. 예외가 발생한 항목은 제외
+        """
+        items = list(items)
+        results = {}
+        if not items:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            futures = {pool.submit(fn, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    results[item] = future.result()
+                except Exception as e:
+                    print(f"[Fetch 오류] {item}: {e}")
+        return results
+
+
+_pykrx_executor = None
+_pykrx_lock = threading.Lock()
+
+
+def get_pykrx_executor():
+    """프로세스 공용 pykrx 실행기 (속도 제한/차단 상태 공유)"""
+    global _pykrx_executor
+    with _pykrx_lock:
+        if _pykrx_executor is None:
+            _pykrx_executor = FetchExecutor()
+        return _pykrx_executor
@@ -1,15 +1,16 @@
 """
-한국 공휴일 체크 유틸리티
+한국 공휴일 / KRX 거래일 체크 유틸리티
 - 법정 공휴일 (holidays 라이브러리)
 - 임시공휴일 (수동 관리 + 환경변수)
+- KRX 휴장일 (근로자의 날, 연말 휴장일, 선거일)
+- TradingCalendar: 프로세스당 1회 생성하는 거래일 달력
 """
 
 import os
-from datetime import datetime, date
+import threading
+from datetime import datetime, date, time, timedelta
 from zoneinfo import ZoneInfo
 
-import holidays
-
 KST = ZoneInfo("Asia/Seoul")
 
 # 임시공휴일 목록 (YYYY-MM-DD 형식)
@@ -18,6 +19,148 @@ TEMPORARY_HOLIDAYS = [
     # "2026-06-04",  # 예시: 임시공휴일
 ]
 
+# KRX 추가 휴장일 (선거일 등 법정 공휴일 목록에 없을 수 있는 날)
+KRX_CLOSURES = [
+    "2024-04-10",  # 제22대 국회의원 선거
+    "2025-06-03",  # 제21대 대통령 선거
+    "2026-06-03",  # 제9회 전국동시지방선거
+]
+
+# 정규장 시작 시각 (연초 개장일은 1시간 늦게 시작)
+MARKET_OPEN = time(9, 0)
+FIRST_DAY_OPEN = time(10, 0)
+
+# 달력 생성 범위 (올해 기준 과거/미래 연수)
+CALENDAR_YEARS_BACK = 3
+CALENDAR_YEARS_AHEAD = 1
+
+
+def _parse_dates(values):
+    result = set()
+    for d in values:
+        d = d.strip()
+        if d:
+            try:
+                result.add(date.fromisoformat(d))
+            except ValueError:
+                pass
+    return result
+
+
+class TradingCalendar:
+    """KRX 거래일 달력. 생성 시 거래일 집합과 날짜별 순번을 미리 계산해 조회는 O(1)."""
+
+    def __init__(self, start_year, end_year):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.first_day = date(start_year, 1, 1)
+        self.last_day = date(end_year, 12, 31)
+
+        import holidays
+
+        years = range(start_year, end_year + 1)
+        self.holidays = set(holidays.KR(years=years).keys())
+        self.holidays |= _parse_dates(TEMPORARY_HOLIDAYS)
+        # 환경변수에서 추가 공휴일 로드 (쉼표 구분, 예: "2026-06-04,2026-10-02")
+        self.holidays |= _parse_dates(os.environ.get("EXTRA_HOLIDAYS", "").split(","))
+
+        closures = set(self.holidays) | _parse_dates(KRX_CLOSURES)
+        for year in years:
+            closures.add(date(year, 5, 1))  # 근로자의 날
+            # 연말 휴장일: 12월 31일 (주말/공휴일이면 직전 평일)
+            closing = date(year, 12, 31)
+            while closing.weekday() >= 5 or closing in self.holidays:
+                closing -= timedelta(days=1)
+            closures.add(closing)
+        self.closures = closures
+
+        # 거래일 목록 + 날짜별 "해당 날짜 이전 거래일 수"
+        self.trading_days = []
+        self._ordinal = {}
+        day = self.first_day
+        while day <= self.last_day:
+            self._ordinal[day] = len(self.trading_days)
+            if day.weekday() < 5 and day not in closures:
+                self.trading_days.append(day)
+            day += timedelta(days=1)
+        self._trading_set = set(self.trading_days)
+        self._first_of_year = {}
+        for day in self.trading_days:
+            self._first_of_year.setdefault(day.year, day)
+
+    def covers(self, target_date):
+        return self.first_day <= target_date <= self.last_day
+
+    def is_holiday(self, target_date):
+        """법정공휴일 + 임시공휴일 여부"""
+        return target_date in self.holidays
+
+    def is_trading_day(self, target_date=None):
+        if target_date is None:
+            target_date = datetime.now(KST).date()
+        return target_date in self._trading_set
+
+    def previous_trading_day(self, target_date=None, n=1):
+        """target_date 이전(당일 제외) n번째 거래일"""
+        if target_date is None:
+            target_date = datetime.now(KST).date()
+        index = self._ordinal[target_date] - n
+        if index < 0:
+            raise ValueError(f"달력 범위 밖: {target_date} 이전 {n}거래일")
+        return self.trading_days[index]
+
+    def next_trading_day(self, target_date=None, n=1):
+        """target_date 이후(당일 제외) n번째 거래일"""
+        if target_date is None:
+            target_date = datetime.now(KST).date()
+        index = self._ordinal[target_date] + (target_date in self._trading_set) + n - 1
+        if index >= len(self.trading_days):
+            raise ValueError(f"달력 범위 밖: {target_date} 이후 {n}거래일")
+        return self.trading_days[index]
+
+    def trading_days_between(self, start, end):
+        """[start, end] 구간 거래일 목록"""
+        if start > end:
+            return []
+        start = max(start, self.first_day)
+        end = min(end, self.last_day)
+        return self.trading_days[self._ordinal[start]:self._ordinal[end] + (end in self._trading_set)]
+
+    def session_open(self, target_date):
+        """거래일의 정규장 시작 시각 (KST)"""
+        open_time = FIRST_DAY_OPEN if self._first_of_year.get(target_date.year) == target_date else MARKET_OPEN
+        return datetime.combine(target_date, open_time, tzinfo=KST)
+
+    def next_session_open(self, now=None):
+        """now 이후 가장 가까운 정규장 시작 시각 (KST)"""
+        if now is None:
+            now = datetime.now(KST)
+        today = now.date()
+        if today in self._trading_set and now < self.session_open(today):
+            return self.session_open(today)
+        return self.session_open(self.next_trading_day(today))
+
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+
+def get_trading_calendar(target_date=None):
+    """프로세스 공용 거래일 달력. 범위 밖 날짜 조회 시에만 범위를 넓혀 재생성."""
+    global _calendar
+    if target_date is None:
+        target_date = datetime.now(KST).date()
+    with _calendar_lock:
+        if _calendar is None or not _calendar.covers(target_date):
+            this_year = datetime.now(KST).year
+            start_year = min(target_date.year, this_year - CALENDAR_YEARS_BACK)
+            end_year = max(target_date.year, this_year + CALENDAR_YEARS_AHEAD)
+            if _calendar is not None:
+                start_year = min(start_year, _calendar.start_year)
+                end_year = max(end_year, _calendar.end_year)
+            _calendar = TradingCalendar(start_year, end_year)
+        return _calendar
+
 
 def is_korean_holiday(target_date: date = None) -> bool:
     """한국 공휴일 여부 확인 (법정공휴일 + 임시공휴일)
@@ -30,29 +173,11 @@ def is_korean_holiday(target_date: date = None) -> bool:
     """
     if target_date is None:
         target_date = datetime.now(KST).date()
+    return get_trading_calendar(target_date).is_holiday(target_date)
 
-    # 법정 공휴일 체크 (대체공휴일 포함)
-    kr_holidays = holidays.KR(years=target_date.year)
-    if target_date in kr_holidays:
-        return True
-
-    # 임시공휴일 체크
-    temp_holidays = set()
-    for d in TEMPORARY_HOLIDAYS:
-        try:
-            temp_holidays.add(date.fromisoformat(d))
-        except ValueError:
-            pass
-
-    # 환경변수에서 추가 공휴일 로드 (쉼표 구분, 예: "2026-06-04,2026-10-02")
-    extra = os.environ.get("EXTRA_HOLIDAYS", "")
-    if extra:
-        for d in extra.split(","):
-            d = d.strip()
-            if d:
-                try:
-                    temp_holidays.add(date.fromisoformat(d))
-                except ValueError:
-                    pass
-
-    return target_date in temp_holidays
+
+def is_trading_day(target_date: date = None) -> bool:
+    """KRX 거래일 여부 확인 (주말, 공휴일, KRX 휴장일 제외)"""
+    if target_date is None:
+        target_date = datetime.now(KST).date()
+    return get_trading_calendar(target_date).is_trading_day(target_date)
@@ -0,0 +1,95 @@
+"""
+장중 포트폴리오 손익 추적
+- check_stocks가 조회한 시세를 그대로 받아 평가 (추가 조회 없음)
+- 체크 주기마다 장중 고가/저가/고점 대비 낙폭을 증분 갱신 (상태 저장소에 거래일별 보관)
+- 전일 종가 기준 총 평가금액 변동률이 임계값 단위를 새로 넘을 때마다 알림 (방향 전환 시 다시 알림)
+"""
+
+import os
+import time
+
+from state_store import get_state_store
+
+# 장중 손익 추적 사용 여부 ("0"이면 끔)
+INTRADAY_PNL_ENABLED = os.environ.get("INTRADAY_PNL", "1") != "0"
+
+# 알림 임계값 (%, 전일 종가 기준 총 평가금액 변동률). 2배, 3배를 넘을 때도 추가 알림
+INTRADAY_THRESHOLD = float(os.environ.get("INTRADAY_PNL_THRESHOLD", "2.0"))
+
+# 상태 DB namespace (key: 거래일 "YYYY-MM-DD")
+INTRADAY_NAMESPACE = "intraday_pnl"
+
+# 상태 보관 기간 (초)
+INTRADAY_TTL = 2 * 24 * 3600
+
+
+class IntradayPnL:
+    def __init__(self, shares, store=None, threshold=INTRADAY_THRESHOLD):
+        """
+        Args:
+            shares: {종목코드: 보유수량}
+        """
+        self.shares = {ticker: count for ticker, count in shares.items() if count}
+        self.store = store or get_state_store()
+        self.threshold = threshold
+
+    def update(self, quotes):
+        """이번 주기 시세 반영.
+
+        Args:
+            quotes: {종목코드: {"current_price", "prev_close", "date", ...}} (check_stocks 조회 결과)
+
+        Returns:
+            현재 손익 dict {"date", "total", "base", "pnl", "change_pct", "high", "low",
+            "drawdown", "max_drawdown", "alert"} (보유 종목 시세가 빠져 있으면 None).
+            "alert"는 이번 주기에 알림 대상이면 True
+        """
+        if not self.shares:
+            return None
+        missing = [ticker for ticker in self.shares if ticker not in quotes]
+        if missing:
+            print(f"[PnL] 시세 없는 보유 종목 {', '.join(missing)} - 장중 손익 스킵")
+            return None
+
+        trade_date = quotes[next(iter(self.shares))]["date"]
+        total = round(sum(count * quotes[ticker]["current_price"] for ticker, count in self.shares.items()))
+        base = round(sum(count * quotes[ticker]["prev_close"] for ticker, count in self.shares.items()))
+        if base <= 0:
+            return None
+
+        state = self.store.get(INTRADAY_NAMESPACE, trade_date) or {
+            "high": total,
+            "low": total,
+            "max_drawdown": 0.0,
+            "samples": 0,
+            "alerted_level": 0,
+        }
+        state["high"] = max(state["high"], total)
+        state["low"] = min(state["low"], total)
+        drawdown = total / state["high"] - 1
+        state["max_drawdown"] = min(state["max_drawdown"], drawdown)
+        state["samples"] += 1
+        state["updated_at"] = time.time()
+
+        # 임계값 단위 (부호 = 방향). 더 큰 단위로 넘어가거나 방향이 바뀌면 알림
+        change_pct = (total - base) / base * 100
+        level = int(abs(change_pct) // self.threshold) * (1 if change_pct > 0 else -1)
+        alerted = state["alerted_level"]
+        alert = level != 0 and (level * alerted <= 0 or abs(level) > abs(alerted))
+        if alert:
+            state["alerted_level"] = level
+
+        self.store.set(INTRADAY_NAMESPACE, trade_date, state, ttl=INTRADAY_TTL)
+
+        return {
+            "date": trade_date,
+            "total": total,
+            "base": base,
+            "pnl": total - base,
+            "change_pct": change_pct,
+            "high": state["high"],
+            "low": state["low"],
+            "drawdown": drawdown,
+            "max_drawdown": state["max_drawdown"],
+            "alert": alert,
+        }
@@ -0,0 +1,222 @@
+"""
+시장 전체 시세 스냅샷 조회
+날짜 단위 일괄 조회(주식 + ETF)로 관심 종목 전체의 등락률을 한 번에 계산
+QuoteSnapshot: 1회 실행 동안 여러 모듈이 공유하는 시세 (TTL 경과 시 재조회)
+"""
+
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from fetch_executor import get_pykrx_executor
+from holiday_checker import get_trading_calendar
+from ohlcv_cache import get_ohlcv_cache
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 공유 스냅샷 유효 시간 (초)
+QUOTE_SNAPSHOT_TTL = 600
+
+
+def fetch_market_snapshot(date_str):
+    """특정 일자의 전 종목(KOSPI/KOSDAQ/KONEX + ETF) 시가/종가 일괄 조회.
+
+    Args:
+        date_str: "YYYYMMDD" 형식
+
+    Returns:
+        {종목코드: {"open": 시가, "close": 종가}}. 휴장일이면 빈 dict
+    """
+    from pykrx import stock
+
+    snapshot = {}
+    executor = get_pykrx_executor()
+    frames = (
+        executor.call(stock.get_market_ohlcv, date_str, market="ALL"),
+        executor.call(stock.get_etf_ohlcv_by_ticker, date_str),
+    )
+    for df in frames:
+        if df is None or df.empty:
+            continue
+        for ticker, open_price, close in zip(df.index, df["시가"].tolist(), df["종가"].tolist()):
+            # 휴장일/장 시작 전에는 종가 0으로 내려옴
+            if close > 0:
+                snapshot[ticker] = {"open": int(open_price), "close": int(close)}
+    return snapshot
+
+
+def _recent_snapshots(count):
+    """최근 거래일 스냅샷 count개 조회 (거래일 달력 기준).
+
+    당일 스냅샷이 비어 있으면 (장 시작 전) 직전 거래일부터 센다.
+    지난 거래일 스냅샷이 비어 있으면 일시 오류로 보고 거기서 중단 (더 이전 거래일로 건너뛰면
+    전일 종가가 틀어지므로 count개보다 적게 반환).
+
+    Returns:
+        [(date, snapshot), ...] 최신순
+    """
+    calendar = get_trading_calendar()
+    today = datetime.now(KST).date()
+
+    snapshots = []
+    if calendar.is_trading_day(today):
+        snapshot = fetch_market_snapshot(today.strftime("%Y%m%d"))
+        if snapshot:
+            snapshots.append((today, snapshot))
+
+    n = 1
+    while len(snapshots) < count:
+        day = calendar.previous_trading_day(today, n)
+        snapshot = fetch_market_snapshot(day.strftime("%Y%m%d"))
+        if not snapshot:
+            print(f"[오류] {day} 시장 스냅샷 비어 있음 (거래일)")
+            break
+        snapshots.append((day, snapshot))
+        n += 1
+    return snapshots
+
+
+def fetch_bulk_quotes(tickers, names=None):
+    """관심 종목 현재가/전일종가/등락률 일괄 계산.
+
+    종목 수와 무관하게 최근 2거래일 시장 스냅샷만 조회한다.
+
+    Args:
+        tickers: 종목코드 목록
+        names: {종목코드: 종목명} (선택)
+
+    Returns:
+        {종목코드: {"ticker", "name", "current_price", "prev_close", "change_pct", "date"}}
+        스냅샷에 없는 종목은 제외. 최근 2거래일 스냅샷을 모두 얻지 못하면 빈 dict
+    """
+    names = names or {}
+    try:
+        snapshots = _recent_snapshots(2)
+    except Exception as e:
+        print(f"[오류] 시장 스냅샷 조회 실패: {e}")
+        return {}
+
+    if len(snapshots) < 2:
+        # 전일 스냅샷 없이는 전일 종가를 알 수 없음 -> 호출 측에서 종목별 조회로 대체
+        print("[오류] 최근 2거래일 시장 스냅샷 조회 실패 - 일괄 조회 생략")
+        return {}
+
+    latest_date, latest = snapshots[0]
+    prev = snapshots[1][1]
+    date_str = latest_date.strftime("%Y-%m-%d")
+
+    quotes = {}
+    for ticker in tickers:
+        bar = latest.get(ticker)
+        if bar is None:
+            continue
+
+        current_price = bar["close"]
+        # 전일 종가 (신규 상장 등으로 전일 데이터 없으면 당일 시가)
+        prev_close = prev[ticker]["close"] if ticker in prev else bar["open"]
+        if not prev_close:
+            continue
+
+        quotes[ticker] = {
+            "ticker": ticker,
+            "name": names.get(ticker, ticker),
+            "current_price": current_price,
+            "prev_close": prev_close,
+            "change_pct": (current_price - prev_close) / prev_close * 100,
+            "date": date_str,
+        }
+    return quotes
+
+
+def _ticker_quote(ticker, name=None):
+    """단일 종목 시세 계산 (실패 시 예외 전파)"""
+    # 오늘 ~ 2거래일 전 (당일 봉이 아직 없으면 직전 2거래일 사용), KST 기준
+    today = datetime.now(KST).date()
+    start_date = get_trading_calendar(today).previous_trading_day(today, 2)
+    end_date = today
+
+    # OHLCV 데이터 조회 (로컬 캐시에 없는 날짜만 pykrx 조회)
+    bars = get_ohlcv_cache().get_ohlcv(ticker, start_date, end_date)
+
+    if not bars:
+        print(f"[오류] {ticker}: 데이터 없음")
+        return None
+
+    # 최근 거래일 데이터
+    current_price = bars[-1]["close"]
+
+    # 전일 종가 계산
+    if len(bars) >= 2:
+        prev_close = bars[-2]["close"]
+    else:
+        prev_close = bars[-1]["open"]
+
+    change_pct = ((current_price - prev_close) / prev_close) * 100
+
+    return {
+        "ticker": ticker,
+        "name": name or ticker,
+        "current_price": current_price,
+        "prev_close": prev_close,
+        "change_pct": change_pct,
+        "date": bars[-1]["date"],
+    }
+
+
+def fetch_ticker_quote(ticker, name=None):
+    """단일 종목 현재가/전일종가/등락률 조회 (일봉 캐시 사용).
+
+    Returns:
+        fetch_bulk_quotes()의 종목별 dict와 같은 형식. 실패 시 None
+    """
+    try:
+        return _ticker_quote(ticker, name)
+    except Exception as e:
+        print(f"[오류] {ticker} 데이터 조회 실패: {e}")
+        return None
+
+
+def fetch_ticker_quotes(tickers, names=None):
+    """여러 종목 개별 조회를 병렬 실행 (공용 pykrx 실행기 사용).
+
+    Returns:
+        {종목코드: 시세 dict}. 조회 실패 종목은 제외
+    """
+    names = names or {}
+    results = get_pykrx_executor().map(lambda ticker: _ticker_quote(ticker, names.get(ticker)), tickers)
+    return {ticker: quote for ticker, quote in results.items() if quote}
+
+
+class QuoteSnapshot:
+    """실행 1회 동안 공유하는 관심 종목 시세.
+
+    최초 조회 시 시장 스냅샷으로 일괄 조회하고, 누락 종목만 개별 조회로 보완한다.
+    TTL 이내에는 재조회 없이 같은 결과를 반환한다.
+    """
+
+    def __init__(self, tickers, names=None, ttl=QUOTE_SNAPSHOT_TTL):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.names = names or {}
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._quotes = {}
+        self._fetched_at = None
+
+    def _expired(self):
+        return self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl
+
+    def quotes(self):
+        """{종목코드: 시세 dict}. 조회 실패 종목은 제외"""
+        with self.lock:
+            if self._expired():
+                quotes = fetch_bulk_quotes(self.tickers, self.names)
+                missing = [ticker for ticker in self.tickers if ticker not in quotes]
+                if missing:
+                    quotes.update(fetch_ticker_quotes(missing, self.names))
+                self._quotes = quotes
+                self._fetched_at = time.monotonic()
+            return self._quotes
+
+    def get(self, ticker):
+        return self.quotes().get(ticker)
@@ -0,0 +1,206 @@
+"""
+종목별 일봉(OHLCV) 로컬 캐시
+- (종목코드, 날짜) 단위로 SQLite에 저장
+- 이미 보유한 구간을 기록해두고 빠진 날짜만 pykrx로 조회
+- 장 마감 전 당일 봉은 미확정이므로 매번 다시 조회
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from fetch_executor import get_pykrx_executor
+from holiday_checker import get_trading_calendar
+
+KST = ZoneInfo("Asia/Seoul")
+
+OHLCV_CACHE_FILE = os.environ.get("OHLCV_CACHE_PATH", "ohlcv_cache.db")
+
+# 당일 일봉 확정 시각 (KST, HHMM). 이 시각 이후 당일 봉도 캐시 구간에 포함
+BAR_FINAL_TIME = 1600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ohlcv (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open INTEGER NOT NULL,
+    high INTEGER NOT NULL,
+    low INTEGER NOT NULL,
+    close INTEGER NOT NULL,
+    volume INTEGER NOT NULL,
+    PRIMARY KEY (ticker, date)
+);
+CREATE TABLE IF NOT EXISTS ohlcv_ranges (
+    ticker TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ohlcv_ranges_ticker ON ohlcv_ranges (ticker);
+"""
+
+
+def _to_date(value):
+    """"YYYYMMDD" / "YYYY-MM-DD" / date -> date"""
+    if isinstance(value, date):
+        return value
+    value = value.replace("-", "")
+    return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+class OhlcvCache:
+    def __init__(self, path=OHLCV_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.fetch_count = 0  # pykrx 실제 조회 횟수
+
+    def _last_final_date(self):
+        """일봉이 확정된 마지막 날짜 (장 마감 전이면 어제)"""
+        now = datetime.now(KST)
+        if now.hour * 100 + now.minute >= BAR_FINAL_TIME:
+            return now.date()
+        return now.date() - timedelta(days=1)
+
+    def _load_ranges(self, ticker):
+        rows = self.conn.execute(
+            "SELECT start, end FROM ohlcv_ranges WHERE ticker = ? ORDER BY start",
+            (ticker,),
+        ).fetchall()
+        return [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in rows]
+
+    def _missing_ranges(self, ticker, start, end):
+        """[start, end] 중 캐시 구간에 포함되지 않은 날짜 구간 목록"""
+        missing = []
+        cursor = start
+        for range_start, range_end in self._load_ranges(ticker):
+            if range_end < cursor:
+                continue
+            if range_start > end:
+                break
+            if range_start > cursor:
+                missing.append((cursor, range_start - timedelta(days=1)))
+            cursor = max(cursor, range_end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            missing.append((cursor, end))
+        return missing
+
+    def _mark_covered(self, ticker, start, end):
+        """보유 구간 추가 후 인접/중첩 구간 병합"""
+        ranges = self._load_ranges(ticker) + [(start, end)]
+        ranges.sort()
+        merged = [ranges[0]]
+        for range_start, range_end in ranges[1:]:
+            last_start, last_end = merged[-1]
+            if range_start <= last_end + timedelta(days=1):
+                merged[-1] = (last_start, max(last_end, range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        self.conn.execute("DELETE FROM ohlcv_ranges WHERE ticker = ?", (ticker,))
+        self.conn.executemany(
+            "INSERT INTO ohlcv_ranges (ticker, start, end) VALUES (?, ?, ?)",
+            [(ticker, s.isoformat(), e.isoformat()) for s, e in merged],
+        )
+
+    def _fetch(self, ticker, start, end):
+        """pykrx에서 구간 조회 후 저장 (네트워크 조회 중에는 잠금 해제).
+
+        구간 내 거래일만 조회하며, 거래일이 없는 구간은 조회 없이 보유 구간으로 기록.
+        조회 결과가 비어 있으면 보유 구간으로 기록하지 않음.
+        """
+        trading_days = get_trading_calendar(start).trading_days_between(start, end)
+
+        rows = []
+        if trading_days:
+            from pykrx import stock
+
+            df = get_pykrx_executor().call(
+                stock.get_market_ohlcv,
+                trading_days[0].strftime("%Y%m%d"),
+                trading_days[-1].strftime("%Y%m%d"),
+                ticker,
+            )
+            if not df.empty:
+                for date_idx, o, h, l, c, v in zip(
+                    df.index,
+                    df["시가"].tolist(),
+                    df["고가"].tolist(),
+                    df["저가"].tolist(),
+                    df["종가"].tolist(),
+                    df["거래량"].tolist(),
+                ):
+                    rows.append((ticker, date_idx.strftime("%Y-%m-%d"), int(o), int(h), int(l), int(c), int(v)))
+
+        with self.lock, self.conn:
+            if trading_days:
+                self.fetch_count += 1
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ohlcv (ticker, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            # 확정된 날짜까지만 보유 구간으로 기록 (당일 미확정 봉은 다음에 다시 조회)
+            final_end = min(end, self._last_final_date())
+            if trading_days:
+                # 실제로 받은 마지막 날짜까지만 (pykrx는 일시 오류/요청 제한 때도 빈 결과를 주므로
+                # 빈 응답이나 끝부분이 빠진 응답의 나머지 구간은 다음에 다시 조회)
+                if not rows:
+                    return
+                final_end = min(final_end, date.fromisoformat(max(row[1] for row in rows)))
+            if start <= final_end:
+                self._mark_covered(ticker, start, final_end)
+
+    def get_ohlcv(self, ticker, start_date, end_date):
+        """구간 일봉 조회 (캐시에 없는 날짜만 pykrx 조회).
+
+        Args:
+            ticker: 종목코드
+            start_date: "YYYYMMDD" 또는 "YYYY-MM-DD" 또는 date
+            end_date: "YYYYMMDD" 또는 "YYYY-MM-DD" 또는 date
+
+        Returns:
+            [{"date": "YYYY-MM-DD", "open", "high", "low", "close", "volume"}] 날짜순
+        """
+        start = _to_date(start_date)
+        end = min(_to_date(end_date), datetime.now(KST).date())
+
+        gaps = []
+        if start <= end:
+            with self.lock:
+                gaps = self._missing_ranges(ticker, start, end)
+        for gap_start, gap_end in gaps:
+            self._fetch(ticker, gap_start, gap_end)
+
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT date, open, high, low, close, volume FROM ohlcv "
+                "WHERE ticker = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (ticker, start.isoformat(), end.isoformat()),
+            ).fetchall()
+
+        return [
+            {"date": d, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for d, o, h, l, c, v in rows
+        ]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_ohlcv_cache():
+    """프로세스 공용 캐시 인스턴스"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = OhlcvCache()
+        return _default_cache
@@ -4,14 +4,10 @@ Google Sheet 업데이트 + Slack 알림
 """
 
 import os
-import tempfile
 from datetime import datetime
 
-import requests
-import yfinance as yf
-from bs4 import BeautifulSoup
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from sheet_mirror import SheetMirror
+from sheet_session import open_session
 
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_CHANNEL = os.environ.get("SLACK_CHANNEL", "#stock_management")
@@ -39,13 +35,23 @@ SHEET_NAME = "Oil Prices"
 
 
 class OilMonitor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-        self.slack_client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
+    def __init__(self, slack_client=None, session=None):
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers.update(HEADERS)
+        self.session = session
+        self.slack_client = slack_client
+        if self.slack_client is None and SLACK_BOT_TOKEN:
+            from slack_sdk import WebClient
+            self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
 
     def fetch_prices(self):
         """WTI/Brent는 yfinance, Dubai는 웹 스크래핑으로 가격 조회"""
+        import yfinance as yf
+        from bs4 import BeautifulSoup
+
         prices = {}
 
         # WTI, Brent - yfinance
@@ -87,56 +93,36 @@ class OilMonitor:
 
         return prices
 
-    def _get_gsheet_client(self):
-        """Google Sheet 클라이언트 생성"""
-        try:
-            import gspread
-            creds_json = os.environ.get("GSHEET_CREDENTIALS")
-            if creds_json:
-                import json
-                creds_path = tempfile.NamedTemporaryFile(
-                    suffix=".json", delete=False, mode="w"
-                )
-                creds_path.write(creds_json)
-                creds_path.close()
-                client = gspread.service_account(filename=creds_path.name)
-                os.unlink(creds_path.name)
-                return client
-            else:
-                print("[GSheet] GSHEET_CREDENTIALS 미설정 - 시트 업데이트 스킵")
-                return None
-        except ImportError:
-            print("[GSheet] gspread 미설치 - 시트 업데이트 스킵")
-            return None
-
-    def update_google_sheet(self, prices, gsheet_client=None):
-        """Google Sheet에 가격 기록 + 전일대비 변동률 계산. 변동률 dict 반환"""
+    def _open_session(self):
+        """단독 실행용 시트 쓰기 세션 생성"""
+        return open_session("[GSheet]")
+
+    def update_google_sheet(self, prices, session=None):
+        """Google Sheet에 가격 기록 + 전일대비 변동률 계산. 변동률 dict 반환
+
+        Args:
+            session: 공유 시트 쓰기 세션 (반영은 호출자가 commit). 없으면 새로 만들어 바로 반영
+        """
         changes = {}
 
-        if not gsheet_client:
-            gsheet_client = self._get_gsheet_client()
-            if not gsheet_client:
+        own_session = session is None
+        if own_session:
+            session = self._open_session()
+            if session is None:
                 return changes
 
         try:
-            spreadsheet = gsheet_client.open_by_key(SPREADSHEET_ID)
-            try:
-                sheet = spreadsheet.worksheet(SHEET_NAME)
-            except Exception:
-                # 탭이 없으면 자동 생성
-                sheet = spreadsheet.add_worksheet(title=SHEET_NAME, rows=1000, cols=10)
-                print(f"[GSheet] '{SHEET_NAME}' 시트탭 생성 완료")
+            # 탭이 없으면 자동 생성
+            sheet = session.worksheet(SPREADSHEET_ID, SHEET_NAME, rows=1000, cols=10)
         except Exception as e:
             print(f"[GSheet 오류] 시트 열기 실패: {e}")
             return changes
 
         today = datetime.now().strftime("%Y-%m-%d")
 
-        # 헤더 확인/생성
-        try:
-            all_values = sheet.get_all_values()
-        except Exception:
-            all_values = []
+        # 헤더 확인/생성 (로컬 미러 증분 동기화)
+        mirror = SheetMirror(sheet, SPREADSHEET_ID)
+        all_values = mirror.sync()
 
         title = ["Oil Prices"]
         headers = ["Date"]
@@ -144,30 +130,35 @@ class OilMonitor:
             headers.extend([f"{oil_type} ($)", f"{oil_type} Change(%)"])
 
         if not all_values:
-            sheet.append_row(title)
-            sheet.append_row(headers)
-            all_values = [title, headers]
+            session.append(sheet, [title, headers])
+            mirror.record_append([title, headers])
+            all_values = mirror.rows
         elif all_values[0][0] != "Oil Prices":
             # 기존 데이터 마이그레이션: 제목+헤더 없이 데이터만 있는 경우
-            existing_data = list(all_values)
-            sheet.clear()
-            sheet.append_row(title)
-            sheet.append_row(headers)
-            for row in existing_data:
-                sheet.append_row(row)
-            all_values = [title, headers] + existing_data
+            # 시트를 비우지 않고 A1부터 값 갱신 1회로 덮어씀 (공유 세션 일괄 반영과 별개로 즉시 실행,
+            # 실패해도 기존 데이터 유지). 행마다 같은 폭으로 채워 이전 값이 남지 않게 함
+            rows = [title, headers] + list(all_values)
+            width = max(len(row) for row in rows)
+            try:
+                sheet.update([row + [""] * (width - len(row)) for row in rows], "A1",
+                             value_input_option="USER_ENTERED")
+            except Exception as e:
+                print(f"[GSheet 오류] 기존 데이터 마이그레이션 실패: {e}")
+                return changes
+            mirror.invalidate()
+            all_values = mirror.sync()
             print("[GSheet] 기존 데이터 마이그레이션 완료 (제목+헤더 추가)")
 
-        # 중복 날짜 체크 (1행=제목, 2행=헤더, 3행~=데이터)
-        existing_dates = [row[0] for row in all_values[2:]]
-        if today in existing_dates:
+        # 중복 날짜 체크 (1행=제목, 2행=헤더, 3행~=데이터, 날짜 인덱스 조회)
+        existing = mirror.find(today)
+        if existing is not None:
             print(f"[GSheet] {today} 데이터 이미 존재 - 스킵")
-            for row in all_values[2:]:
-                if row[0] == today:
-                    for i, oil_type in enumerate(OIL_TYPES):
-                        col = 1 + i * 2 + 1  # Change 컬럼
-                        if col < len(row) and row[col]:
-                            changes[oil_type] = row[col]
+            for i, oil_type in enumerate(OIL_TYPES):
+                col = 1 + i * 2 + 1  # Change 컬럼
+                if col < len(existing) and existing[col]:
+                    changes[oil_type] = existing[col]
+            if own_session:
+                session.commit()  # 제목/헤더 추가분 반영
             return changes
 
         # 전일 가격 가져오기 (마지막 데이터 행)
@@ -197,7 +188,10 @@ class OilMonitor:
                 price_str = str(price_val)
             row.extend([price_str, change])
 
-        sheet.append_row(row)
+        session.append(sheet, [row])
+        mirror.record_append([row])
+        if own_session:
+            session.commit()
         print(f"[GSheet] {today} 유가 업데이트 완료")
         return changes
 
@@ -230,6 +224,8 @@ class OilMonitor:
         message = "\n".join(lines)
 
         if self.slack_client:
+            from slack_sdk.errors import SlackApiError
+
             try:
                 self.slack_client.chat_postMessage(
                     channel=SLACK_CHANNEL,
@@ -241,7 +237,7 @@ class OilMonitor:
         else:
             print(message.replace("*", ""))
 
-    def run(self, gsheet_client=None):
+    def run(self, session=None):
         """가격 조회 → Google Sheet 업데이트 → Slack 알림"""
         print("[Oil] 유가 조회 중...")
         prices = self.fetch_prices()
@@ -252,5 +248,5 @@ class OilMonitor:
 
         print(f"[Oil] {len(prices)}개 유종 가격 조회 완료")
 
-        changes = self.update_google_sheet(prices, gsheet_client)
+        changes = self.update_google_sheet(prices, session)
         self.send_slack_alert(prices, changes)
@@ -0,0 +1,207 @@
+"""
+포트폴리오 성과 분석
+- 일별 평가액 이력으로 누적/기간 수익률, 최대 낙폭(MDD), 연환산 변동성, 샤프 지수, 종목별 기여도 계산
+- 전체 이력은 NumPy 벡터 연산 1회로 계산, 이후에는 새 날짜만 반영하는 증분 갱신 (상태는 전용 저장소 파일에 보관)
+- 일간 수익률은 총 평가금액 변화 기준 (매수/매도에 의한 평가액 변화도 포함)
+"""
+
+import math
+import os
+import threading
+
+import numpy as np
+
+from state_store import StateStore
+
+# 연환산 기준 거래일 수
+TRADING_DAYS = 252
+
+# 샤프 지수 무위험 수익률 (연, 소수)
+RISK_FREE_RATE = float(os.environ.get("PORTFOLIO_RISK_FREE_RATE", "0.03"))
+
+# 기간 수익률 구간 (거래일): 1주, 1개월, 3개월
+ROLLING_WINDOWS = (5, 20, 60)
+
+PORTFOLIO_ANALYTICS_FILE = os.environ.get("PORTFOLIO_ANALYTICS_PATH", "portfolio_analytics.db")
+ANALYTICS_NAMESPACE = "portfolio_analytics"
+
+
+class PortfolioAnalytics:
+    def __init__(self, tickers, state=None):
+        self.tickers = list(tickers)
+        self.state = state
+
+    @classmethod
+    def from_history(cls, dates, positions, totals, tickers):
+        """전체 이력으로 생성 (벡터 연산).
+
+        Args:
+            dates: "YYYY-MM-DD" 오름차순
+            positions: 종목별 평가액 (날짜 수, 종목 수)
+            totals: 총 평가금액 (날짜 수,) - 0 이하인 날짜는 제외
+        """
+        totals = np.asarray(totals, dtype=np.float64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(len(totals), len(tickers))
+        valid = totals > 0
+        totals, positions = totals[valid], positions[valid]
+        dates = [d for d, ok in zip(dates, valid.tolist()) if ok]
+
+        analytics = cls(tickers)
+        if not len(totals):
+            return analytics
+
+        returns = totals[1:] / totals[:-1] - 1
+        peak = np.maximum.accumulate(totals)
+        mean = float(returns.mean()) if len(returns) else 0.0
+        contributions = (np.diff(positions, axis=0) / totals[:-1, None]).sum(axis=0)
+
+        analytics.state = {
+            "count": len(totals),
+            "first_date": dates[0],
+            "last_date": dates[-1],
+            "first_total": float(totals[0]),
+            "peak": float(peak[-1]),
+            "max_drawdown": float((totals / peak - 1).min()),
+            "returns": len(returns),
+            "mean": mean,
+            "m2": float(((returns - mean) ** 2).sum()),
+            "contributions": contributions.tolist(),
+            "last_positions": positions[-1].tolist(),
+            "recent_totals": totals[-(max(ROLLING_WINDOWS) + 1):].tolist(),
+        }
+        return analytics
+
+    def update(self, date_str, positions, total):
+        """새 날짜 1개 반영 (O(1)). 마지막 날짜 이전/같은 날짜나 평가액 0 이하는 무시. 반영 시 True"""
+        if total <= 0:
+            return False
+        positions = [float(value) for value in positions]
+        total = float(total)
+
+        if self.state is None:
+            self.state = PortfolioAnalytics.from_history([date_str], [positions], [total], self.tickers).state
+            return True
+
+        state = self.state
+        if date_str <= state["last_date"]:
+            return False
+
+        prev_total = state["recent_totals"][-1]
+        daily = total / prev_total - 1
+
+        # 일간 수익률 평균/분산 (Welford)
+        state["returns"] += 1
+        delta = daily - state["mean"]
+        state["mean"] += delta / state["returns"]
+        state["m2"] += delta * (daily - state["mean"])
+
+        state["peak"] = max(state["peak"], total)
+        state["max_drawdown"] = min(state["max_drawdown"], total / state["peak"] - 1)
+        state["contributions"] = [
+            contribution + (value - prev_value) / prev_total
+            for contribution, value, prev_value in zip(state["contributions"], positions, state["last_positions"])
+        ]
+
+        state["count"] += 1
+        state["last_date"] = date_str
+        state["last_positions"] = positions
+        state["recent_totals"] = (state["recent_totals"] + [total])[-(max(ROLLING_WINDOWS) + 1):]
+        return True
+
+    def metrics(self):
+        """성과 지표 dict (이력이 없으면 None).
+
+        Returns:
+            {"start", "end", "days", "cumulative_return", "rolling_returns": {거래일: 수익률},
+             "max_drawdown", "current_drawdown", "volatility", "sharpe",
+             "contributions": {종목코드: 누적 수익률 기여(소수)}}
+            수익률/낙폭/변동성은 소수 (0.05 = 5%), 계산 불가 항목은 None
+        """
+        state = self.state
+        if state is None:
+            return None
+
+        recent = state["recent_totals"]
+        last_total = recent[-1]
+        rolling = {
+            window: (last_total / recent[-window - 1] - 1) if len(recent) > window else None
+            for window in ROLLING_WINDOWS
+        }
+
+        volatility = None
+        sharpe = None
+        if state["returns"] > 1:
+            volatility = math.sqrt(state["m2"] / (state["returns"] - 1)) * math.sqrt(TRADING_DAYS)
+            if volatility > 0:
+                sharpe = (state["mean"] * TRADING_DAYS - RISK_FREE_RATE) / volatility
+
+        return {
+            "start": state["first_date"],
+            "end": state["last_date"],
+            "days": state["count"],
+            "cumulative_return": last_total / state["first_total"] - 1,
+            "rolling_returns": rolling,
+            "max_drawdown": state["max_drawdown"],
+            "current_drawdown": last_total / state["peak"] - 1,
+            "volatility": volatility,
+            "sharpe": sharpe,
+            "contributions": dict(zip(self.tickers, state["contributions"])),
+        }
+
+
+def load_analytics(store, key, tickers):
+    """저장된 분석 상태 -> (PortfolioAnalytics, 원본 위치). 없거나 종목이 다르면 (None, None)"""
+    saved = store.get(ANALYTICS_NAMESPACE, key)
+    if not saved or saved.get("tickers") != list(tickers) or not saved.get("state"):
+        return None, None
+    return PortfolioAnalytics(tickers, saved["state"]), saved.get("source")
+
+
+def save_analytics(store, key, analytics, source=None):
+    """
+    Args:
+        source: 상태에 반영한 원본 위치 (예: 시트 행 수/마지막 행 날짜). 다음 갱신 때 그 뒤 행만 읽는 데 사용
+    """
+    store.set(ANALYTICS_NAMESPACE, key, {"tickers": list(analytics.tickers), "state": analytics.state, "source": source})
+
+
+def refresh_analytics(store, key, dates, positions, totals, tickers, source=None):
+    """저장된 분석 상태를 이력에 맞춰 갱신 후 반환.
+
+    저장된 상태가 이력의 앞부분과 일치하면 (마지막 날짜까지 날짜 수가 같으면)
+    새 날짜만 증분 반영하고, 아니면 (과거 날짜 추가/삭제, 종목 변경 등) 전체 다시 계산.
+
+    Args:
+        store: StateStore
+        key: 상태 저장 key
+        dates/positions/totals: 날짜순 전체 이력
+        source: 함께 저장할 원본 위치 (save_analytics)
+    """
+    saved, _ = load_analytics(store, key, tickers)
+    analytics = None
+    if saved is not None:
+        state = saved.state
+        included = [i for i, d in enumerate(dates) if d <= state["last_date"] and totals[i] > 0]
+        if included and len(included) == state["count"] and dates[included[-1]] == state["last_date"]:
+            analytics = PortfolioAnalytics(tickers, state)
+            for i in range(included[-1] + 1, len(dates)):
+                analytics.update(dates[i], positions[i], totals[i])
+
+    if analytics is None:
+        analytics = PortfolioAnalytics.from_history(dates, positions, totals, tickers)
+
+    save_analytics(store, key, analytics, source)
+    return analytics
+
+
+_analytics_store = None
+_analytics_lock = threading.Lock()
+
+
+def get_analytics_store():
+    """분석 상태 전용 저장소 (날짜별로 캐시되는 실행 상태와 분리해 누적 상태를 날짜와 무관하게 유지)"""
+    global _analytics_store
+    with _analytics_lock:
+        if _analytics_store is None:
+            _analytics_store = StateStore(PORTFOLIO_ANALYTICS_FILE)
+        return _analytics_store
@@ -4,17 +4,30 @@
 """
 
 import os
-import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
-from pykrx import stock
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from fetch_executor import get_pykrx_executor
+from market_data import QuoteSnapshot
+from ohlcv_cache import get_ohlcv_cache
+from portfolio_analytics import (
+    ROLLING_WINDOWS,
+    get_analytics_store,
+    load_analytics,
+    refresh_analytics,
+    save_analytics,
+)
+from price_matrix import PriceMatrix
+from sheet_mirror import SheetMirror
+from sheet_session import open_session
+from state_store import get_state_store
+from trade_ledger import DEFAULT_ACCOUNT, load_ledger
 
 KST = ZoneInfo("Asia/Seoul")
 
-# 보유 종목 (종목코드: {종목명, 보유수량})
+# 보유 종목 (종목코드: {종목명, 보유수량}) - 시트 열 순서/종목명 기준
+# 매매 원장(portfolio_ledger.csv)이 있으면 보유수량은 원장에서 날짜별로 계산
 HOLDINGS = {
     "091160": {"name": "KODEX 반도체", "shares": 12188},
     "491820": {"name": "HANARO 전력설비투자", "shares": 30212},
@@ -35,106 +48,130 @@ SPREADSHEET_ID = os.environ.get(
 )
 SHEET_NAME = "Portfolio"
 
+# 총 평가금액 열 (0부터, Date + 종목별 평가액 다음) / 해당 열 문자
+TOTAL_COL = 1 + len(STOCK_ORDER)
 
-class PortfolioTracker:
-    def __init__(self):
-        self.slack_client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
+NUMBER_FORMAT = {"numberFormat": {"type": "NUMBER", "pattern": "#,##0"}}
 
-    def _get_gsheet_client(self):
-        """Google Sheet 클라이언트 생성"""
-        try:
-            import gspread
-            creds_json = os.environ.get("GSHEET_CREDENTIALS")
-            if creds_json:
-                import tempfile
-                creds_path = tempfile.NamedTemporaryFile(
-                    suffix=".json", delete=False, mode="w"
-                )
-                creds_path.write(creds_json)
-                creds_path.close()
-                client = gspread.service_account(filename=creds_path.name)
-                os.unlink(creds_path.name)
-                return client
-            else:
-                print("[Portfolio] GSHEET_CREDENTIALS 미설정 - 시트 업데이트 스킵")
-                return None
-        except ImportError:
-            print("[Portfolio] gspread 미설치 - 시트 업데이트 스킵")
-            return None
+# 행 추가 시 열별 서식 (B열~총평가금액열 콤마 서식)
+ROW_FORMATS = {col: NUMBER_FORMAT for col in range(1, TOTAL_COL + 1)}
 
-    def fetch_bulk_prices(self, start_date, end_date):
-        """기간 내 전 종목 종가 일괄 조회.
+# 백필 구간 크기 (일) / 체크포인트 namespace (key: 시트 + 시작일, value: 완료한 마지막 날짜)
+BACKFILL_CHUNK_DAYS = 90
+BACKFILL_NAMESPACE = "backfill"
+
+
+class PortfolioTracker:
+    def __init__(self, slack_client=None, ledger=None):
+        self.slack_client = slack_client
+        if self.slack_client is None and SLACK_BOT_TOKEN:
+            from slack_sdk import WebClient
+            self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
+
+        # 매매 원장 (없으면 HOLDINGS 고정 보유수량)
+        self.ledger = ledger if ledger is not None else load_ledger()
+        if self.ledger is not None:
+            unknown = [ticker for ticker in self.ledger.tickers if ticker not in HOLDINGS]
+            if unknown:
+                print(f"[Portfolio] 원장 종목 중 HOLDINGS에 없는 종목 제외: {', '.join(unknown)}")
+
+    def _open_session(self):
+        """단독 실행용 시트 쓰기 세션 생성"""
+        return open_session("[Portfolio]")
+
+    def fetch_price_matrix(self, start_date, end_date, strict=False):
+        """기간 내 전 종목 종가 행렬 조회 (날짜 x STOCK_ORDER).
 
         Args:
             start_date: "YYYYMMDD" 형식
             end_date: "YYYYMMDD" 형식
+            strict: True면 조회 실패 종목이 있을 때 RuntimeError (일부 종목만 빠진 행 방지)
+        """
+        cache = get_ohlcv_cache()
+        bars_by_ticker = get_pykrx_executor().map(
+            lambda ticker: cache.get_ohlcv(ticker, start_date, end_date), STOCK_ORDER
+        )
+        failed = [ticker for ticker in STOCK_ORDER if ticker not in bars_by_ticker]
+        if strict and failed:
+            raise RuntimeError(f"종가 조회 실패 종목: {', '.join(failed)}")
+        return PriceMatrix.from_bars(bars_by_ticker, STOCK_ORDER)
+
+    def fetch_bulk_prices(self, start_date, end_date):
+        """기간 내 전 종목 종가 일괄 조회.
 
         Returns:
             {날짜("YYYY-MM-DD"): {종목코드: 종가(int)}}
         """
-        all_prices = {}
-        for ticker in STOCK_ORDER:
-            df = stock.get_market_ohlcv(start_date, end_date, ticker)
-            for date_idx, row in df.iterrows():
-                date_key = date_idx.strftime("%Y-%m-%d")
-                if date_key not in all_prices:
-                    all_prices[date_key] = {}
-                all_prices[date_key][ticker] = int(row["종가"])
-            time.sleep(0.5)
-        return all_prices
-
-    def calculate_portfolio(self, prices):
+        return self.fetch_price_matrix(start_date, end_date).as_dict()
+
+    def shares_on(self, date_str):
+        """해당 날짜 보유수량 {종목코드: 수량} (전 계좌 합산)"""
+        if self.ledger is None:
+            return {ticker: HOLDINGS[ticker]["shares"] for ticker in STOCK_ORDER}
+        return self.ledger.positions_on(date_str, STOCK_ORDER)
+
+    def value_matrix(self, matrix):
+        """가격 행렬 전 기간 평가액 일괄 계산 (전 계좌 합산, 날짜별 보유수량 반영).
+
+        Returns:
+            (종목별 평가액 (날짜 수, 종목 수), 총 평가금액 (날짜 수,))
+        """
+        if self.ledger is None:
+            shares = [HOLDINGS[ticker]["shares"] for ticker in matrix.tickers]
+        else:
+            shares = self.ledger.holdings(matrix.dates, matrix.tickers).sum(axis=0)
+        return matrix.valuation(shares)
+
+    def value_accounts(self, matrix):
+        """계좌별 전 기간 평가액 일괄 계산 (전 계좌를 행렬 연산 1회로).
+
+        Returns:
+            {계좌: (종목별 평가액 (날짜 수, 종목 수), 총 평가금액 (날짜 수,))}
+        """
+        if self.ledger is None:
+            return {DEFAULT_ACCOUNT: self.value_matrix(matrix)}
+        positions, totals = matrix.valuation(self.ledger.holdings(matrix.dates, matrix.tickers))
+        return {
+            account: (positions[i], totals[i])
+            for i, account in enumerate(self.ledger.accounts)
+        }
+
+    def calculate_portfolio(self, prices, date_str=None):
         """종목별 평가액 및 총 평가금액 계산.
 
         Args:
             prices: {종목코드: 종가(int)}
+            date_str: 보유수량 기준일 "YYYY-MM-DD" (없으면 오늘)
 
         Returns:
             {"stocks": {종목코드: {"name", "shares", "price", "value"}}, "total_value": int}
         """
+        shares = self.shares_on(date_str or datetime.now(KST).strftime("%Y-%m-%d"))
         stocks = {}
         total = 0
         for ticker in STOCK_ORDER:
-            info = HOLDINGS[ticker]
             price = prices.get(ticker, 0)
-            value = price * info["shares"]
+            value = price * shares[ticker]
             stocks[ticker] = {
-                "name": info["name"],
-                "shares": info["shares"],
+                "name": HOLDINGS[ticker]["name"],
+                "shares": shares[ticker],
                 "price": price,
                 "value": value,
             }
             total += value
         return {"stocks": stocks, "total_value": total}
 
-    def update_google_sheet(self, date_str, portfolio_data, gsheet_client=None):
-        """Google Sheet에 포트폴리오 데이터 기록. 전일대비 변동률 반환.
-
-        Args:
-            date_str: "YYYY-MM-DD" 형식
-            portfolio_data: calculate_portfolio() 반환값
-        """
-        change_info = {"total_change_pct": "", "total_change_amt": 0}
-
-        if not gsheet_client:
-            gsheet_client = self._get_gsheet_client()
-            if not gsheet_client:
-                return change_info
-
+    def _open_sheet(self, session):
+        """Portfolio 시트 열기 (없으면 생성). 실패 시 None"""
         try:
-            spreadsheet = gsheet_client.open_by_key(SPREADSHEET_ID)
-            try:
-                sheet = spreadsheet.worksheet(SHEET_NAME)
-            except Exception:
-                sheet = spreadsheet.add_worksheet(title=SHEET_NAME, rows=1000, cols=15)
+            return session.worksheet(SPREADSHEET_ID, SHEET_NAME, rows=1000, cols=15)
         except Exception as e:
             print(f"[Portfolio] 시트 열기 실패: {e}")
-            return change_info
+            return None
 
-        try:
-            all_values = sheet.get_all_values()
-        except Exception:
-            all_values = []
+    def _read_sheet(self, mirror):
+        """시트 전체 값 조회 (로컬 미러 증분 동기화, 헤더가 없으면 생성 후 포함해서 반환)"""
+        all_values = mirror.sync()
 
         # 헤더 생성 (첫 행이 "Date"가 아니면 헤더 없음으로 판단)
         headers = ["Date"]
@@ -143,39 +180,82 @@ class PortfolioTracker:
         headers.extend(["총 평가금액", "전일대비(%)"])
 
         if not all_values or (all_values and all_values[0][0] != "Date"):
-            sheet.insert_row(headers, index=1)
-            all_values.insert(0, headers)
+            mirror.sheet.insert_row(headers, index=1)
+            mirror.record_insert(0, headers)
+        return mirror.rows
 
-        # 중복 날짜 체크
-        existing_dates = [row[0] for row in all_values[1:]]
-        if date_str in existing_dates:
-            print(f"[Portfolio] {date_str} 데이터 이미 존재 - 스킵")
-            for row in all_values[1:]:
-                if row[0] == date_str:
-                    total_col = 1 + len(STOCK_ORDER)
-                    change_col = total_col + 1
-                    if total_col < len(row) and row[total_col]:
-                        try:
-                            change_info["total_change_amt"] = 0
-                        except ValueError:
-                            pass
-                    if change_col < len(row) and row[change_col]:
-                        change_info["total_change_pct"] = row[change_col]
-            return change_info
+    def _row_total(self, row):
+        """시트 행의 총 평가금액 (없거나 형식 오류면 0)"""
+        return self._cell_int(row, TOTAL_COL)
 
-        # 전일 총 평가금액
-        prev_total = 0
-        if len(all_values) > 1:
-            last_row = all_values[-1]
-            total_col = 1 + len(STOCK_ORDER)
-            if total_col < len(last_row) and last_row[total_col]:
-                try:
-                    prev_total = int(last_row[total_col].replace(",", ""))
-                except (ValueError, AttributeError):
-                    prev_total = 0
+    def _cell_int(self, row, col):
+        """시트 행의 숫자 셀 값 (없거나 형식 오류면 0)"""
+        if col < len(row) and row[col]:
+            try:
+                return int(str(row[col]).replace(",", ""))
+            except ValueError:
+                return 0
+        return 0
+
+    def performance(self, rows=None, session=None):
+        """시트에 기록된 일별 평가액 이력 기준 성과 지표 (PortfolioAnalytics.metrics()).
+
+        분석 상태는 전용 저장소(get_analytics_store)에 반영한 시트 위치(행 수, 마지막 행 날짜)와 함께 보관.
+        그 위치가 그대로면 이후 행만 읽어 증분 반영, 아니면 (행 삽입/삭제, 과거 날짜 추가) 전체 다시 계산.
+
+        Args:
+            rows: 시트 전체 행 (헤더 포함). 없으면 시트를 읽음
+            session: rows가 없을 때 사용할 시트 세션
+        """
+        if rows is None:
+            session = session or self._open_session()
+            sheet = self._open_sheet(session) if session else None
+            if sheet is None:
+                return None
+            rows = self._read_sheet(SheetMirror(sheet, SPREADSHEET_ID))
+
+        store = get_analytics_store()
+        key = f"{SPREADSHEET_ID}/{SHEET_NAME}"
+        source = {"rows": len(rows), "last": rows[-1][0] if rows and rows[-1] else ""}
+
+        analytics, saved_source = load_analytics(store, key, STOCK_ORDER)
+        if analytics is not None and self._source_matches(rows, saved_source):
+            dates, positions, totals = self._history(rows[saved_source["rows"]:])
+            if all(date_str > analytics.state["last_date"] for date_str in dates):
+                for date_str, values, total in zip(dates, positions, totals):
+                    analytics.update(date_str, values, total)
+                save_analytics(store, key, analytics, source)
+                return analytics.metrics()
+
+        dates, positions, totals = self._history(rows[1:])
+        analytics = refresh_analytics(store, key, dates, positions, totals, STOCK_ORDER, source=source)
+        return analytics.metrics()
+
+    def _source_matches(self, rows, source):
+        """저장된 분석 상태가 반영한 위치까지 시트 행이 그대로인지 (그 행의 날짜로 확인)"""
+        if not source:
+            return False
+        count = source.get("rows", 0)
+        return 0 < count <= len(rows) and bool(rows[count - 1]) and rows[count - 1][0] == source.get("last")
+
+    def _history(self, rows):
+        """데이터 행 -> 날짜순 (날짜, 종목별 평가액, 총 평가금액) 목록"""
+        history = sorted((row for row in rows if row and row[0]), key=lambda row: row[0])
+        dates = [row[0] for row in history]
+        positions = [[self._cell_int(row, 1 + j) for j in range(len(STOCK_ORDER))] for row in history]
+        totals = [self._row_total(row) for row in history]
+        return dates, positions, totals
+
+    def _build_row(self, date_str, values, total_value, prev_total):
+        """시트에 기록할 행과 전일대비 변동 정보 생성
+
+        Args:
+            values: STOCK_ORDER 순서 종목별 평가액
+            total_value: 총 평가금액
+        """
+        change_info = {"total_change_pct": "", "total_change_amt": 0}
 
         # 변동률 계산
-        total_value = portfolio_data["total_value"]
         change_pct = ""
         if prev_total > 0:
             pct = (total_value - prev_total) / prev_total * 100
@@ -183,23 +263,67 @@ class PortfolioTracker:
             change_info["total_change_pct"] = change_pct
             change_info["total_change_amt"] = total_value - prev_total
 
-        # 행 추가
-        row = [date_str]
-        for ticker in STOCK_ORDER:
-            row.append(portfolio_data["stocks"][ticker]["value"])
-        row.extend([total_value, change_pct])
-
-        sheet.append_row(row)
-
-        # 숫자 셀에 콤마 서식 적용 (B열~총평가금액열)
-        row_num = len(all_values) + 1
-        total_col_letter = chr(ord("A") + 1 + len(STOCK_ORDER))  # H
-        sheet.format(f"B{row_num}:{total_col_letter}{row_num}", {
-            "numberFormat": {"type": "NUMBER", "pattern": "#,##0"}
-        })
-        print(f"[Portfolio] {date_str} 데이터 기록 완료")
+        row = [date_str] + list(values) + [total_value, change_pct]
+        return row, change_info
+
+    def update_google_sheet(self, date_str, portfolio_data, session=None):
+        """Google Sheet에 포트폴리오 데이터 기록. 전일대비 변동률 반환.
+
+        Args:
+            date_str: "YYYY-MM-DD" 형식
+            portfolio_data: calculate_portfolio() 반환값
+            session: 공유 시트 쓰기 세션 (반영은 호출자가 commit). 없으면 새로 만들어 바로 반영
+        """
+        change_info = {"total_change_pct": "", "total_change_amt": 0}
+
+        own_session = session is None
+        if own_session:
+            session = self._open_session()
+            if session is None:
+                return change_info
+
+        sheet = self._open_sheet(session)
+        if sheet is None:
+            return change_info
+
+        mirror = SheetMirror(sheet, SPREADSHEET_ID)
+        all_values = self._read_sheet(mirror)
+
+        # 중복 날짜 체크 (미러 날짜 인덱스)
+        existing = mirror.find(date_str)
+        if existing is not None:
+            print(f"[Portfolio] {date_str} 데이터 이미 존재 - 스킵")
+            change_col = TOTAL_COL + 1
+            if change_col < len(existing) and existing[change_col]:
+                change_info["total_change_pct"] = existing[change_col]
+            change_info["metrics"] = self._safe_performance(mirror.rows)
+            return change_info
+
+        # 전일 총 평가금액
+        prev_total = self._row_total(all_values[-1]) if len(all_values) > 1 else 0
+
+        # 행 추가 (값 + 콤마 서식)
+        values = [portfolio_data["stocks"][ticker]["value"] for ticker in STOCK_ORDER]
+        row, change_info = self._build_row(date_str, values, portfolio_data["total_value"], prev_total)
+        session.append(sheet, [row], formats=ROW_FORMATS)
+        mirror.record_append([row])
+        change_info["metrics"] = self._safe_performance(mirror.rows)
+
+        if own_session:
+            session.commit()
+            print(f"[Portfolio] {date_str} 데이터 기록 완료")
+        else:
+            print(f"[Portfolio] {date_str} 데이터 기록 예약 (일괄 반영)")
         return change_info
 
+    def _safe_performance(self, rows):
+        """성과 지표 계산 (실패해도 시트 기록 흐름은 계속)"""
+        try:
+            return self.performance(rows)
+        except Exception as e:
+            print(f"[Portfolio] 성과 지표 계산 실패: {e}")
+            return None
+
     def send_slack_alert(self, date_str, portfolio_data, change_info):
         """Slack에 포트폴리오 현황 발송"""
         total = portfolio_data["total_value"]
@@ -226,10 +350,33 @@ class PortfolioTracker:
             amt = change_info.get("total_change_amt", 0)
             lines.append(f"{'전일대비':<14} {'':>10} {amt:>+14,}원 ({change_info['total_change_pct']})")
 
+        # 성과 지표 (시트 이력 기준)
+        metrics = change_info.get("metrics")
+        if metrics:
+            def pct(value):
+                return f"{value * 100:+.2f}%" if value is not None else "-"
+
+            lines.append("")
+            lines.append(f"성과 ({metrics['start']} ~ {metrics['end']}, {metrics['days']}거래일)")
+            lines.append(f"  누적 수익률   {pct(metrics['cumulative_return'])}")
+            rolling = "  ".join(
+                f"{window}일 {pct(metrics['rolling_returns'][window])}" for window in ROLLING_WINDOWS
+            )
+            lines.append(f"  기간 수익률   {rolling}")
+            lines.append(f"  최대 낙폭     {pct(metrics['max_drawdown'])} (현재 {pct(metrics['current_drawdown'])})")
+            volatility = f"{metrics['volatility'] * 100:.2f}%" if metrics["volatility"] is not None else "-"
+            sharpe = f"{metrics['sharpe']:.2f}" if metrics["sharpe"] is not None else "-"
+            lines.append(f"  변동성(연)    {volatility}  샤프 {sharpe}")
+            lines.append("  종목별 기여")
+            for ticker in STOCK_ORDER:
+                lines.append(f"    {HOLDINGS[ticker]['name']:<14} {pct(metrics['contributions'][ticker])}")
+
         lines.append("```")
         message = "\n".join(lines)
 
         if self.slack_client:
+            from slack_sdk.errors import SlackApiError
+
             try:
                 self.slack_client.chat_postMessage(
                     channel=SLACK_CHANNEL,
@@ -241,26 +388,35 @@ class PortfolioTracker:
         else:
             print(message.replace("*", ""))
 
-    def run(self):
-        """오늘 날짜 기준 포트폴리오 업데이트 (일간 실행용)"""
+    def run(self, snapshot=None, session=None):
+        """오늘 날짜 기준 포트폴리오 업데이트 (일간 실행용)
+
+        Args:
+            snapshot: 공유 시세 스냅샷 (QuoteSnapshot). 없으면 보유 종목으로 새로 조회
+            session: 공유 시트 쓰기 세션. 없으면 새로 생성
+
+        Returns:
+            send_slack_alert 인자 (날짜, 포트폴리오 데이터, 변동 정보 + 성과 지표). 종가가 없으면 None
+        """
         today = datetime.now(KST)
         date_str = today.strftime("%Y-%m-%d")
-        start_pykrx = (today - timedelta(days=7)).strftime("%Y%m%d")
-        end_pykrx = today.strftime("%Y%m%d")
 
         print(f"[Portfolio] {date_str} 포트폴리오 업데이트 시작")
 
-        # 최근 7일 범위로 조회 (당일 데이터 미확정 시 최신 거래일 사용)
+        if snapshot is None:
+            names = {ticker: HOLDINGS[ticker]["name"] for ticker in STOCK_ORDER}
+            snapshot = QuoteSnapshot(STOCK_ORDER, names)
+
+        # 최신 거래일 종가 사용 (당일 데이터 미확정 시 직전 거래일)
+        quotes = snapshot.quotes()
         prices = {}
         actual_date = None
         for ticker in STOCK_ORDER:
-            df = stock.get_market_ohlcv(start_pykrx, end_pykrx, ticker)
-            if not df.empty:
-                latest_date = df.index[-1].strftime("%Y-%m-%d")
+            quote = quotes.get(ticker)
+            if quote:
                 if actual_date is None:
-                    actual_date = latest_date
-                prices[ticker] = int(df["종가"].iloc[-1])
-            time.sleep(0.3)
+                    actual_date = quote["date"]
+                prices[ticker] = int(quote["current_price"])
 
         if not prices:
             print("[Portfolio] 종가 데이터 없음 - 스킵")
@@ -271,37 +427,115 @@ class PortfolioTracker:
             print(f"[Portfolio] 당일 데이터 미확정, 최신 거래일 사용: {actual_date}")
             date_str = actual_date
 
-        portfolio_data = self.calculate_portfolio(prices)
-        self.update_google_sheet(date_str, portfolio_data)
-
-    def backfill(self, start_date, end_date):
-        """과거 데이터 일괄 기록.
+        portfolio_data = self.calculate_portfolio(prices, date_str)
+        change_info = self.update_google_sheet(date_str, portfolio_data, session=session)
+        return date_str, portfolio_data, change_info
+
+    def _backfill_chunks(self, start, end, chunk_days):
+        """[start, end] 구간을 chunk_days일 단위로 분할. [(시작 date, 끝 date)]"""
+        chunks = []
+        chunk_days = max(1, chunk_days)
+        while start <= end:
+            chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+            chunks.append((start, chunk_end))
+            start = chunk_end + timedelta(days=1)
+        return chunks
+
+    def _fetch_chunk(self, chunk):
+        chunk_start, chunk_end = chunk
+        return self.fetch_price_matrix(
+            chunk_start.strftime("%Y%m%d"), chunk_end.strftime("%Y%m%d"), strict=True
+        )
+
+    def backfill(self, start_date, end_date, session=None, chunk_days=BACKFILL_CHUNK_DAYS, resume=True):
+        """과거 데이터 일괄 기록 (구간 분할 + 체크포인트, 중단 후 이어서 실행 가능).
+
+        시트는 1회만 읽고, 구간(chunk_days일)마다 평가액을 가격 행렬 연산으로 계산해
+        값 + 숫자 서식을 batchUpdate 1회로 반영. 반영이 끝난 구간의 마지막 날짜를
+        상태 저장소에 체크포인트로 기록하고, 다시 실행하면 그 다음 날부터 진행.
+        현재 구간을 시트에 쓰는 동안 다음 구간 종가를 미리 조회.
 
         Args:
             start_date: "YYYYMMDD" 형식
             end_date: "YYYYMMDD" 형식
+            chunk_days: 구간 크기 (일)
+            resume: False면 체크포인트 무시하고 처음부터 진행
+
+        Returns:
+            기록한 행 수
         """
         print(f"[Portfolio] 백필 시작: {start_date} ~ {end_date}")
 
-        gsheet_client = self._get_gsheet_client()
-        if not gsheet_client:
+        if session is None:
+            session = self._open_session()
+        if session is None:
             print("[Portfolio] Google Sheet 연결 불가 - 백필 중단")
-            return
+            return 0
 
-        # 종목별 종가 일괄 조회
-        all_prices = self.fetch_bulk_prices(start_date, end_date)
-        if not all_prices:
-            print("[Portfolio] 데이터 없음")
-            return
-
-        sorted_dates = sorted(all_prices.keys())
-        count = 0
-
-        for date_str in sorted_dates:
-            prices = all_prices[date_str]
-            portfolio_data = self.calculate_portfolio(prices)
-            self.update_google_sheet(date_str, portfolio_data, gsheet_client=gsheet_client)
-            count += 1
-            time.sleep(0.3)
-
-        print(f"[Portfolio] 백필 완료: {count}일 데이터 기록")
+        sheet = self._open_sheet(session)
+        if sheet is None:
+            print("[Portfolio] Google Sheet 연결 불가 - 백필 중단")
+            return 0
+
+        start = datetime.strptime(start_date, "%Y%m%d").date()
+        end = min(datetime.strptime(end_date, "%Y%m%d").date(), datetime.now(KST).date())
+
+        # 체크포인트 (같은 시트 + 같은 시작일 기준, 종료일을 늘려 다시 실행해도 이어서 진행)
+        store = get_state_store()
+        checkpoint_key = f"{SPREADSHEET_ID}/{SHEET_NAME}/{start_date}"
+        if resume:
+            done = store.get(BACKFILL_NAMESPACE, checkpoint_key)
+            if done:
+                start = max(start, date.fromisoformat(done) + timedelta(days=1))
+                print(f"[Portfolio] 체크포인트 {done}까지 완료 - {start}부터 이어서 진행")
+
+        chunks = self._backfill_chunks(start, end, chunk_days)
+        if not chunks:
+            print("[Portfolio] 백필할 구간 없음 (이미 완료)")
+            return 0
+
+        mirror = SheetMirror(sheet, SPREADSHEET_ID)
+        all_values = self._read_sheet(mirror)
+        existing_dates = {row[0] for row in all_values[1:] if row}
+        prev_total = self._row_total(all_values[-1]) if len(all_values) > 1 else 0
+
+        written = 0
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            future = prefetch.submit(self._fetch_chunk, chunks[0])
+            for i, (chunk_start, chunk_end) in enumerate(chunks):
+                try:
+                    matrix = future.result()
+                except Exception as e:
+                    print(f"[Portfolio] {chunk_start} ~ {chunk_end} 종가 조회 실패: {e} - 백필 중단 (다음 실행 시 이어서)")
+                    return written
+
+                # 현재 구간 기록 중 다음 구간 미리 조회
+                if i + 1 < len(chunks):
+                    future = prefetch.submit(self._fetch_chunk, chunks[i + 1])
+
+                # 구간 평가액 일괄 계산 후 행 구성
+                positions, totals = self.value_matrix(matrix)
+                rows = []
+                for date_str, values, total_value in zip(matrix.dates, positions.tolist(), totals.tolist()):
+                    if date_str in existing_dates:
+                        continue
+                    row, _ = self._build_row(date_str, values, total_value, prev_total)
+                    rows.append(row)
+                    prev_total = total_value
+
+                if rows:
+                    # 값 + 숫자 서식 일괄 추가 (B열~총평가금액열)
+                    session.append(sheet, rows, formats=ROW_FORMATS)
+                    mirror.record_append(rows)
+                    if not session.commit():
+                        print(f"[Portfolio] {chunk_start} ~ {chunk_end} 시트 반영 실패 - 백필 중단 (다음 실행 시 이어서)")
+                        return written
+                    existing_dates.update(row[0] for row in rows)
+                    written += len(rows)
+
+                store.set(BACKFILL_NAMESPACE, checkpoint_key, chunk_end.isoformat())
+                print(f"[Portfolio] {chunk_start} ~ {chunk_end}: {len(rows)}일 기록 ({i + 1}/{len(chunks)})")
+
+        store.checkpoint()
+        print(f"[Portfolio] 백필 완료: {written}일 데이터 기록")
+        return written
@@ -0,0 +1,67 @@
+"""
+날짜 x 종목 가격 행렬
+- 종목별 일봉을 (날짜 수, 종목 수) NumPy 배열 하나로 보관 (값이 없는 칸은 NaN)
+- 날짜/종목 -> 행/열 인덱스 유지
+- 보유수량과 곱해 전 기간 평가액을 한 번에 계산 (날짜별 Python 반복 없음)
+"""
+
+import numpy as np
+
+
+class PriceMatrix:
+    def __init__(self, dates, tickers, values):
+        self.dates = list(dates)      # "YYYY-MM-DD" 오름차순
+        self.tickers = list(tickers)
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.dates), len(self.tickers))
+        self.date_index = {d: i for i, d in enumerate(self.dates)}
+        self.ticker_index = {t: j for j, t in enumerate(self.tickers)}
+
+    @classmethod
+    def from_bars(cls, bars_by_ticker, tickers, field="close"):
+        """종목별 일봉 목록으로 생성.
+
+        Args:
+            bars_by_ticker: {종목코드: [{"date": "YYYY-MM-DD", field: 값, ...}]}
+            tickers: 열 순서
+            field: 사용할 값 (기본 종가)
+        """
+        dates = sorted({bar["date"] for ticker in tickers for bar in bars_by_ticker.get(ticker) or []})
+        date_index = {d: i for i, d in enumerate(dates)}
+
+        values = np.full((len(dates), len(tickers)), np.nan)
+        for j, ticker in enumerate(tickers):
+            bars = bars_by_ticker.get(ticker) or []
+            if not bars:
+                continue
+            rows = np.fromiter((date_index[bar["date"]] for bar in bars), dtype=np.intp, count=len(bars))
+            values[rows, j] = np.fromiter((bar[field] for bar in bars), dtype=np.float64, count=len(bars))
+        return cls(dates, tickers, values)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def prices_at(self, date_str):
+        """해당 날짜 {종목코드: 가격(int)} (값 없는 종목 제외)"""
+        i = self.date_index.get(date_str)
+        if i is None:
+            return {}
+        row = self.values[i]
+        return {ticker: int(row[j]) for j, ticker in enumerate(self.tickers) if not np.isnan(row[j])}
+
+    def as_dict(self):
+        """{날짜: {종목코드: 가격(int)}} (값 없는 칸 제외)"""
+        return {date_str: self.prices_at(date_str) for date_str in self.dates}
+
+    def valuation(self, shares):
+        """보유수량을 곱한 평가액 일괄 계산 (가격 없는 칸은 0).
+
+        Args:
+            shares: 종목별 보유수량 (종목 수,), 날짜별 보유수량 (날짜 수, 종목 수)
+                    또는 계좌별 (계좌 수, 날짜 수, 종목 수)
+
+        Returns:
+            (종목별 평가액 (..., 날짜 수, 종목 수) int64, 총 평가금액 (..., 날짜 수) int64)
+        """
+        prices = np.nan_to_num(self.values, nan=0.0)
+        positions = np.rint(prices * np.asarray(shares, dtype=np.float64)).astype(np.int64)
+        return positions, positions.sum(axis=-1)
@@ -5,4 +5,4 @@ if [ -f .env ]; then
     export $(cat .env | grep -v '^#' | xargs)
 fi
 
-python3 stock_monitor.py
+python3 run_daemon.py
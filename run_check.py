@@ -1,45 +1,61 @@
 """
 GitHub Actions용 - 종목 체크 (1회 실행)
 """
-import os
-import json
-from pathlib import Path
-from stock_monitor import StockMonitor
-from holiday_checker import is_korean_holiday
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
-# 알림 기록 파일 (GitHub Actions 캐시용)
-ALERT_FILE = "alerts_today.json"
+from holiday_checker import is_trading_day
+from intraday_pnl import INTRADAY_PNL_ENABLED, IntradayPnL
+from state_store import get_state_store
 
+KST = ZoneInfo("Asia/Seoul")
 
-def load_alerts():
-    """오늘 알림 기록 로드"""
-    if Path(ALERT_FILE).exists():
-        with open(ALERT_FILE, "r") as f:
-            return json.load(f)
-    return {}
+# 알림 기록 (상태 DB namespace, key: "{종목}_{날짜}", value: "up"/"down")
+ALERT_NAMESPACE = "alerts"
 
+# 알림 기록 보관 기간 (초). 날짜가 키에 포함되므로 당일 이후엔 불필요
+ALERT_TTL = 2 * 24 * 3600
 
-def save_alerts(alerts):
-    """알림 기록 저장"""
-    with open(ALERT_FILE, "w") as f:
-        json.dump(alerts, f)
 
-
-def main():
-    if is_korean_holiday():
-        print("[주식] 오늘은 공휴일 - 스킵")
+def main(clients=None):
+    if not is_trading_day():
+        print("[주식] 오늘은 휴장일 - 스킵")
         return
 
-    monitor = StockMonitor()
+    from stock_monitor import StockMonitor
 
-    # 이전 알림 기록 로드
-    monitor.alerted_stocks = load_alerts()
+    store = get_state_store()
+    store.purge_expired()
+
+    # 장중 포트폴리오 손익 (보유수량은 매매 원장/HOLDINGS 기준)
+    pnl = None
+    if INTRADAY_PNL_ENABLED:
+        from portfolio_tracker import PortfolioTracker
 
-    # 종목 체크
-    monitor.check_stocks()
+        tracker = PortfolioTracker(slack_client=clients.slack if clients else None)
+        pnl = IntradayPnL(tracker.shares_on(datetime.now(KST).strftime("%Y-%m-%d")), store=store)
 
-    # 알림 기록 저장
-    save_alerts(monitor.alerted_stocks)
+    monitor = StockMonitor(slack_client=clients.slack if clients else None, pnl=pnl)
+
+    # 이전 알림 기록 로드
+    previous = store.items(ALERT_NAMESPACE)
+    monitor.alerted_stocks = dict(previous)
+
+    # 종목 체크 (알림은 백그라운드 발송, 종료 전 발송 완료 대기)
+    try:
+        monitor.check_stocks()
+    finally:
+        monitor.close()
+
+    # 변경된 알림 기록만 저장
+    changed = {
+        key: direction
+        for key, direction in monitor.alerted_stocks.items()
+        if previous.get(key) != direction
+    }
+    if changed:
+        store.set_many(ALERT_NAMESPACE, changed, ttl=ALERT_TTL)
+    store.checkpoint()
 
 
 if __name__ == "__main__":
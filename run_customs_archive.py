@@ -0,0 +1,48 @@
+"""
+관세청 수출입 현황 과거 보도자료 일괄 수집 + 시계열 CSV 작성
+이미 캐시(customs_cache.db)된 게시물은 다시 받지 않으므로 중단 후 다시 실행하면 이어서 진행
+
+사용법:
+    python run_customs_archive.py                         # 전체 게시판 수집 후 customs_series.csv 작성
+    python run_customs_archive.py --since 2020-01-01      # 등록일 기준 시작일
+    python run_customs_archive.py --workers 4 --processes 8
+    python run_customs_archive.py --series-only           # 수집 없이 캐시로 시계열만 다시 작성
+                                                          # (항목 정의가 바뀌었으면 저장된 페이지 텍스트로 재추출)
+"""
+import argparse
+
+from customs_archive import (
+    ARCHIVE_MAX_PAGES,
+    ARCHIVE_PROCESSES,
+    ARCHIVE_RATE,
+    ARCHIVE_WORKERS,
+    SERIES_FILE,
+    CustomsArchive,
+)
+from customs_cache import get_release_store
+from fetch_executor import FetchExecutor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관세청 수출입 현황 과거 보도자료 일괄 수집")
+    parser.add_argument("--since", default=None, help="등록일 시작 YYYY-MM-DD (기본 전체)")
+    parser.add_argument("--max-pages", type=int, default=ARCHIVE_MAX_PAGES, help="게시판 최대 페이지 수")
+    parser.add_argument("--workers", type=int, default=ARCHIVE_WORKERS, help="동시 다운로드 수")
+    parser.add_argument("--rate", type=float, default=ARCHIVE_RATE, help="초당 요청 수 (게시물당 상세 조회 + 다운로드 2건)")
+    parser.add_argument("--processes", type=int, default=ARCHIVE_PROCESSES, help="PDF 분석 프로세스 수")
+    parser.add_argument("--output", default=SERIES_FILE, help="시계열 CSV 경로")
+    parser.add_argument("--series-only", action="store_true", help="수집 없이 시계열만 작성")
+    args = parser.parse_args()
+
+    executor = FetchExecutor(rate=args.rate, burst=args.workers, max_workers=args.workers)
+    archive = CustomsArchive(executor=executor, processes=args.processes)
+    try:
+        if not args.series_only:
+            archive.ingest(since=args.since, max_pages=args.max_pages)
+        archive.write_series(args.output)
+    finally:
+        get_release_store().checkpoint()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,46 +4,64 @@ GitHub Actions용 - 관세청 수출입 현황 게시물 체크 (1회 실행)
 import json
 from datetime import datetime
 from pathlib import Path
-from customs_monitor import CustomsMonitor
+from customs_cache import get_release_store
 from holiday_checker import is_korean_holiday
+from state_store import LAST_RUN_NAMESPACE, get_state_store
 
-SEEN_FILE = "customs_seen.json"
+# 확인한 게시물 (상태 DB namespace, key: ntt_sn, value: 제목)
+SEEN_NAMESPACE = "customs_seen"
 
+# 이전 버전 상태 파일 (최초 1회 상태 DB로 이전)
+LEGACY_SEEN_FILE = "customs_seen.json"
 
-def load_seen():
-    if Path(SEEN_FILE).exists():
-        with open(SEEN_FILE, "r") as f:
-            return json.load(f)
-    return {}
 
+def migrate_legacy_seen(store):
+    if not Path(LEGACY_SEEN_FILE).exists() or store.items(SEEN_NAMESPACE):
+        return
 
-def save_seen(seen):
-    with open(SEEN_FILE, "w") as f:
-        json.dump(seen, f, ensure_ascii=False)
+    with open(LEGACY_SEEN_FILE, "r") as f:
+        data = json.load(f)
+    seen_posts = data.get("posts", data if isinstance(data, dict) and "last_run_date" not in data else {})
+    store.set_many(SEEN_NAMESPACE, seen_posts)
+    if data.get("last_run_date"):
+        store.set(LAST_RUN_NAMESPACE, "customs", data["last_run_date"])
+    print(f"[관세청] {LEGACY_SEEN_FILE} -> 상태 DB 이전 ({len(seen_posts)}건)")
 
 
-def main():
+def main(clients=None):
     if is_korean_holiday():
         print("[관세청] 오늘은 공휴일 - 스킵")
         return
 
-    data = load_seen()
-    seen_posts = data.get("posts", data if isinstance(data, dict) and "last_run_date" not in data else {})
-    last_run_date = data.get("last_run_date", "")
+    store = get_state_store()
+    migrate_legacy_seen(store)
+
+    last_run_date = store.get(LAST_RUN_NAMESPACE, "customs", "")
     today = datetime.now().strftime("%Y-%m-%d")
 
     if last_run_date == today:
         print(f"[관세청] {today} 이미 체크 완료 - 스킵")
         return
 
-    monitor = CustomsMonitor()
-    monitor.seen_posts = seen_posts
+    from customs_monitor import CustomsMonitor
+
+    if clients:
+        monitor = CustomsMonitor(slack_client=clients.slack, session=clients.session)
+    else:
+        monitor = CustomsMonitor()
+
+    seen_posts = store.items(SEEN_NAMESPACE)
+    monitor.seen_posts = dict(seen_posts)
     try:
         monitor.check_new_posts()
     except Exception as e:
         print(f"[오류] 관세청 모니터링 실패: {e}")
 
-    save_seen({"posts": monitor.seen_posts, "last_run_date": today})
+    new_posts = {ntt_sn: title for ntt_sn, title in monitor.seen_posts.items() if ntt_sn not in seen_posts}
+    store.set_many(SEEN_NAMESPACE, new_posts)
+    store.set(LAST_RUN_NAMESPACE, "customs", today)
+    store.checkpoint()
+    get_release_store().checkpoint()
 
 
 if __name__ == "__main__":
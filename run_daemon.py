@@ -0,0 +1,67 @@
+"""
+상주 실행용 - 모든 모니터 작업을 프로세스 내 스케줄러로 실행
+GitHub Actions cron 대신 자체 서버에서 실행 (import/연결/캐시가 실행 간 유지됨)
+
+일정 (KST):
+    stock    장중 30분 간격 (거래일)
+    summary  16:00 ~ 17:30 30분 간격, 1일 1회 발송 (거래일)
+    customs  15:00 (공휴일 제외)
+    dram     16:00 (공휴일 제외)
+    oil      09:00 (평일)
+"""
+import signal
+
+from clients import SharedClients
+from runner import run_job
+from scheduler import (
+    CALENDAR_ANY,
+    CALENDAR_NON_HOLIDAY,
+    CALENDAR_TRADING,
+    ScheduledJob,
+    Scheduler,
+)
+from customs_cache import get_release_store
+from sheet_mirror import get_mirror_store
+from state_store import get_state_store
+
+# (작업 이름, cron, 달력 조건, 제한 시간(초))
+DAEMON_JOBS = [
+    ("stock", "0,30 9-15 * * 1-5", CALENDAR_TRADING, 600),
+    ("summary", "0,30 16-17 * * 1-5", CALENDAR_TRADING, 900),
+    ("customs", "0 15 * * 1-5", CALENDAR_NON_HOLIDAY, 900),
+    ("dram", "0 16 * * 1-5", CALENDAR_NON_HOLIDAY, 600),
+    ("oil", "0 9 * * 1-5", CALENDAR_ANY, 600),
+]
+
+
+def main():
+    clients = SharedClients()
+
+    jobs = [
+        ScheduledJob(name, cron, lambda name=name: run_job(name, clients), calendar, timeout)
+        for name, cron, calendar, timeout in DAEMON_JOBS
+    ]
+    scheduler = Scheduler(jobs)
+
+    def handle_signal(signum, frame):
+        print("\n[Daemon] 종료 신호 수신")
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    print("=" * 60)
+    print("모니터링 데몬 시작")
+    print("=" * 60)
+    try:
+        scheduler.run()
+    finally:
+        clients.close()
+        get_state_store().close()
+        get_mirror_store().close()
+        get_release_store().close()
+        print("[Daemon] 종료")
+
+
+if __name__ == "__main__":
+    main()
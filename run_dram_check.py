@@ -1,20 +1,28 @@
 """
 GitHub Actions용 - DRAM 가격 체크 (1회 실행)
 """
-from dram_monitor import DramMonitor
 from holiday_checker import is_korean_holiday
+from sheet_mirror import get_mirror_store
 
 
-def main():
+def main(clients=None):
     if is_korean_holiday():
         print("[DRAM] 오늘은 공휴일 - 스킵")
         return
 
-    monitor = DramMonitor()
+    from dram_monitor import DramMonitor
+
+    if clients:
+        monitor = DramMonitor(slack_client=clients.slack, session=clients.session)
+        session = clients.sheet_session
+    else:
+        monitor = DramMonitor()
+        session = None
     try:
-        monitor.run()
+        monitor.run(session)
     except Exception as e:
         print(f"[오류] DRAM 모니터링 실패: {e}")
+    get_mirror_store().checkpoint()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+"""
+여러 모니터 작업 통합 실행 (1회 실행)
+
+사용법:
+    python run_jobs.py dram oil customs
+    python run_jobs.py            # 전체 작업
+"""
+import sys
+
+from runner import JOBS, run_jobs
+
+
+def main():
+    names = sys.argv[1:] or list(JOBS)
+    results = run_jobs(names)
+    if not all(results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,21 @@ GitHub Actions용 - 유가 체크 (1회 실행)
 유가는 주식과 달리 공휴일에도 평일이면 기록
 """
 from oil_monitor import OilMonitor
+from sheet_mirror import get_mirror_store
 
 
-def main():
-    monitor = OilMonitor()
+def main(clients=None):
+    if clients:
+        monitor = OilMonitor(slack_client=clients.slack, session=clients.session)
+        session = clients.sheet_session
+    else:
+        monitor = OilMonitor()
+        session = None
     try:
-        monitor.run()
+        monitor.run(session)
     except Exception as e:
         print(f"[오류] 유가 모니터링 실패: {e}")
+    get_mirror_store().checkpoint()
 
 
 if __name__ == "__main__":
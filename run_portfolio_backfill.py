@@ -1,12 +1,29 @@
 """
-1회성 백필: 포트폴리오 보유가치 과거 데이터 (2026-02-19 ~ 2026-03-19)
+포트폴리오 보유가치 과거 데이터 백필
+구간 단위로 기록하고 체크포인트를 남겨, 중단되면 다시 실행 시 이어서 진행
+
+사용법:
+    python run_portfolio_backfill.py                                  # 2026-02-19 ~ 오늘
+    python run_portfolio_backfill.py --start 20200102 --end 20251231
+    python run_portfolio_backfill.py --chunk-days 30                  # 구간 크기 (일)
+    python run_portfolio_backfill.py --restart                        # 체크포인트 무시
 """
-from portfolio_tracker import PortfolioTracker
+import argparse
+from datetime import datetime
+
+from portfolio_tracker import BACKFILL_CHUNK_DAYS, KST, PortfolioTracker
 
 
 def main():
+    parser = argparse.ArgumentParser(description="포트폴리오 보유가치 과거 데이터 백필")
+    parser.add_argument("--start", default="20260219", help="시작일 YYYYMMDD")
+    parser.add_argument("--end", default=datetime.now(KST).strftime("%Y%m%d"), help="종료일 YYYYMMDD (기본 오늘)")
+    parser.add_argument("--chunk-days", type=int, default=BACKFILL_CHUNK_DAYS, help="구간 크기 (일)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트 무시하고 처음부터")
+    args = parser.parse_args()
+
     tracker = PortfolioTracker()
-    tracker.backfill("20260219", "20260319")
+    tracker.backfill(args.start, args.end, chunk_days=args.chunk_days, resume=not args.restart)
 
 
 if __name__ == "__main__":
@@ -1,33 +1,37 @@
 """
 GitHub Actions용 - 일일 요약 발송 (1회 실행)
 """
-import json
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from pathlib import Path
-from stock_monitor import StockMonitor
-from holiday_checker import is_korean_holiday
-from portfolio_tracker import PortfolioTracker
+from holiday_checker import is_trading_day
+from sheet_mirror import get_mirror_store
+from state_store import LAST_RUN_NAMESPACE, get_state_store
 
 KST = ZoneInfo("Asia/Seoul")
-SUMMARY_STATE_FILE = "summary_state.json"
 
 
-def main():
-    if is_korean_holiday():
-        print("[주식] 오늘은 공휴일 - 일일 요약 스킵")
+def main(clients=None):
+    if not is_trading_day():
+        print("[주식] 오늘은 휴장일 - 일일 요약 스킵")
         return
 
     today = datetime.now(KST).strftime("%Y-%m-%d")
 
-    if Path(SUMMARY_STATE_FILE).exists():
-        with open(SUMMARY_STATE_FILE, "r") as f:
-            state = json.load(f)
-        if state.get("last_summary_date") == today:
-            print(f"[주식] {today} 일일 요약 이미 발송 - 스킵")
-            return
+    store = get_state_store()
+    if store.get(LAST_RUN_NAMESPACE, "summary") == today:
+        print(f"[주식] {today} 일일 요약 이미 발송 - 스킵")
+        return
+
+    from stock_monitor import StockMonitor, STOCK_LIST
+    from market_data import QuoteSnapshot
+    from portfolio_tracker import PortfolioTracker, HOLDINGS
+
+    # 일일 요약 + 포트폴리오가 같은 시세를 공유 (종목당 1회 조회)
+    names = dict(STOCK_LIST)
+    names.update({ticker: info["name"] for ticker, info in HOLDINGS.items()})
+    snapshot = QuoteSnapshot(list(STOCK_LIST) + list(HOLDINGS), names)
 
-    monitor = StockMonitor()
+    monitor = StockMonitor(snapshot=snapshot, slack_client=clients.slack if clients else None)
     success = monitor.send_daily_summary()
 
     if not success:
@@ -36,13 +40,20 @@ def main():
 
     # 포트폴리오 보유가치 업데이트
     try:
-        tracker = PortfolioTracker()
-        tracker.run()
+        tracker = PortfolioTracker(slack_client=clients.slack if clients else None)
+        report = tracker.run(snapshot=snapshot, session=clients.sheet_session if clients else None)
+        if report:
+            tracker.send_slack_alert(*report)  # 보유 현황 + 성과 지표
     except Exception as e:
         print(f"[Portfolio] 포트폴리오 업데이트 실패: {e}")
 
-    with open(SUMMARY_STATE_FILE, "w") as f:
-        json.dump({"last_summary_date": today}, f)
+    store.set(LAST_RUN_NAMESPACE, "summary", today)
+    store.checkpoint()
+    get_mirror_store().checkpoint()
+
+    from portfolio_analytics import get_analytics_store
+
+    get_analytics_store().checkpoint()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+"""
+여러 모니터 작업을 한 프로세스에서 실행
+- Slack/HTTP 세션/Google Sheet 클라이언트를 한 번만 만들어 모든 작업이 공유
+- 서로 독립적인 작업은 스레드로 동시 실행 (전체 소요시간 = 가장 느린 작업)
+- 작업들의 Google Sheet 쓰기는 모두 끝난 뒤 batchUpdate 1회로 반영
+"""
+
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from clients import SharedClients
+
+# 작업 이름: 실행 모듈 (각 모듈의 main(clients) 호출)
+JOBS = {
+    "stock": "run_check",
+    "summary": "run_summary",
+    "customs": "run_customs_check",
+    "dram": "run_dram_check",
+    "oil": "run_oil_check",
+}
+
+# 공용 시트 세션에 쓰기를 예약하는 작업 (일괄 반영 실패 시 실패로 처리)
+SHEET_JOBS = {"summary", "dram", "oil"}
+
+
+def run_job(name, clients, commit_sheets=True):
+    """단일 작업 실행. (성공 여부, 소요시간) 반환
+
+    Args:
+        commit_sheets: 작업 후 시트 쓰기 반영 여부 (여러 작업을 묶을 때는 호출자가 반영)
+    """
+    started = time.monotonic()
+    try:
+        module = importlib.import_module(JOBS[name])
+        module.main(clients)
+        ok = True
+    except Exception as e:
+        print(f"[Runner] {name} 실패: {e}")
+        ok = False
+    if commit_sheets and not clients.commit_sheets():
+        print(f"[Runner] {name} 시트 반영 실패")
+        ok = False
+    return ok, time.monotonic() - started
+
+
+def run_jobs(names, clients=None):
+    """작업 목록 동시 실행.
+
+    Args:
+        names: JOBS 키 목록
+        clients: 공유 클라이언트 (없으면 새로 생성 후 종료 시 정리)
+
+    Returns:
+        {작업 이름: 성공 여부}
+    """
+    unknown = [name for name in names if name not in JOBS]
+    if unknown:
+        raise ValueError(f"알 수 없는 작업: {', '.join(unknown)}")
+
+    own_clients = clients is None
+    if own_clients:
+        clients = SharedClients()
+
+    started = time.monotonic()
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(names))) as pool:
+            futures = {name: pool.submit(run_job, name, clients, False) for name in names}
+            for name, future in futures.items():
+                ok, elapsed = future.result()
+                results[name] = ok
+                print(f"[Runner] {name} {'완료' if ok else '실패'} ({elapsed:.1f}초)")
+    finally:
+        if not clients.commit_sheets():
+            failed = [name for name in names if name in SHEET_JOBS]
+            print(f"[Runner] 시트 일괄 반영 실패 ({', '.join(failed)})")
+            for name in failed:
+                results[name] = False
+        if own_clients:
+            clients.close()
+
+    print(f"[Runner] 전체 {len(names)}개 작업 {time.monotonic() - started:.1f}초")
+    return results
@@ -0,0 +1,167 @@
+"""
+프로세스 내 작업 스케줄러 (데몬 모드용)
+- cron 형식 일정 ("분 시 일 월 요일", KST 기준)
+- 거래일/공휴일 달력 기준 실행 여부 판단
+- 다음 실행 시각을 일정에서 직접 계산 (sleep 오차 누적 없음)
+- 작업별 제한 시간, 이전 실행이 끝나지 않았으면 중복 실행하지 않음
+"""
+
+import threading
+import time as time_module
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from holiday_checker import is_korean_holiday, is_trading_day
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 최대 대기 단위 (초). 시스템 시각 변경에도 1분 이내 재계산
+MAX_SLEEP = 60
+
+# 다음 실행 시각 탐색 최대 일수
+SEARCH_DAYS = 366 * 2
+
+# 달력 조건
+CALENDAR_ANY = None            # 매일 (cron 조건만 적용)
+CALENDAR_TRADING = "trading"   # KRX 거래일만
+CALENDAR_NON_HOLIDAY = "non_holiday"  # 공휴일 제외
+
+
+def _parse_field(field, low, high):
+    """cron 필드 1개 -> 허용 값 집합. "*", "a-b", "*/n", "a-b/n", "a,b" 지원"""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/")
+            step = int(step_str)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-"))
+        else:
+            start = end = int(part)
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"cron 필드 범위 오류: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSpec:
+    def __init__(self, expr):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 형식 오류 (필드 5개 필요): {expr}")
+        self.expr = expr
+        self.minutes = sorted(_parse_field(fields[0], 0, 59))
+        self.hours = sorted(_parse_field(fields[1], 0, 23))
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        # cron 요일: 0,7=일요일 -> Python weekday (월=0)
+        self.weekdays = {(d - 1) % 7 for d in _parse_field(fields[4], 0, 7)}
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = day.weekday() in self.weekdays
+        # cron 규칙: 일/요일 모두 지정 시 둘 중 하나만 맞아도 실행
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after):
+        """after 이후(초과) 가장 가까운 실행 시각 (KST)"""
+        start = (after.astimezone(KST) + timedelta(minutes=1)).replace(second=0, microsecond=0)
+        day = start.date()
+        for _ in range(SEARCH_DAYS):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime.combine(day, time(hour, minute), tzinfo=KST)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"실행 시각 없음: {self.expr}")
+
+
+class ScheduledJob:
+    def __init__(self, name, cron, fn, calendar=CALENDAR_ANY, timeout=600):
+        self.name = name
+        self.spec = CronSpec(cron)
+        self.fn = fn
+        self.calendar = calendar
+        self.timeout = timeout
+        self.next_run = None
+        self.running = False
+
+    def should_run(self, run_date):
+        if self.calendar == CALENDAR_TRADING:
+            return is_trading_day(run_date)
+        if self.calendar == CALENDAR_NON_HOLIDAY:
+            return not is_korean_holiday(run_date)
+        return True
+
+
+class Scheduler:
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+
+    def _execute(self, job, scheduled):
+        """작업 실행 + 제한 시간 감시 (제한 초과 시 경고만, 완료 전 재실행 안 함)"""
+        done = threading.Event()
+
+        def target():
+            started = time_module.monotonic()
+            try:
+                job.fn()
+                print(f"[Scheduler] {job.name} 완료 ({time_module.monotonic() - started:.1f}초)")
+            except Exception as e:
+                print(f"[Scheduler] {job.name} 실패: {e}")
+            finally:
+                with self.lock:
+                    job.running = False
+                done.set()
+
+        print(f"[Scheduler] {job.name} 시작 (예정 {scheduled.strftime('%Y-%m-%d %H:%M')})")
+        threading.Thread(target=target, name=f"job-{job.name}", daemon=True).start()
+        if not done.wait(job.timeout):
+            print(f"[Scheduler] {job.name} 제한 시간 {job.timeout}초 초과 - 완료 전까지 다음 실행 건너뜀")
+
+    def _dispatch(self, job, scheduled):
+        if not job.should_run(scheduled.date()):
+            print(f"[Scheduler] {job.name} 휴장/공휴일 - 스킵")
+            return
+        with self.lock:
+            if job.running:
+                print(f"[Scheduler] {job.name} 이전 실행 진행 중 - 스킵")
+                return
+            job.running = True
+        threading.Thread(target=self._execute, args=(job, scheduled), daemon=True).start()
+
+    def run(self):
+        now = datetime.now(KST)
+        for job in self.jobs:
+            job.next_run = job.spec.next_after(now)
+            print(f"[Scheduler] {job.name}: '{job.spec.expr}' 다음 실행 {job.next_run.strftime('%Y-%m-%d %H:%M')}")
+
+        while not self.stop_event.is_set():
+            now = datetime.now(KST)
+            due_at = min(job.next_run for job in self.jobs)
+            wait = (due_at - now).total_seconds()
+            if wait > 0:
+                self.stop_event.wait(min(wait, MAX_SLEEP))
+                continue
+
+            for job in self.jobs:
+                if job.next_run <= now:
+                    self._dispatch(job, job.next_run)
+                    # 다음 실행은 일정 기준으로 계산 (지연/누락분은 합쳐서 1회)
+                    job.next_run = job.spec.next_after(now)
+
+    def stop(self):
+        self.stop_event.set()
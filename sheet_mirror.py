@@ -0,0 +1,108 @@
+"""
+Google Sheet 탭 로컬 미러
+- 탭 전체 값을 로컬 DB에 보관하고 첫 열(날짜) -> 행 인덱스 유지
+- 동기화 시 마지막으로 확인한 행부터 끝까지만 읽음 (이력 길이와 무관하게 일정 비용)
+- 마지막 확인 행의 날짜가 로컬과 다르면 (행 삭제/정렬 등) 전체 다시 읽기
+- 과거 행 내용 수정은 감지하지 않음 (추가 전용 이력 탭 기준)
+"""
+
+import os
+import threading
+
+from state_store import StateStore
+
+SHEET_MIRROR_FILE = os.environ.get("SHEET_MIRROR_PATH", "sheet_mirror.db")
+MIRROR_NAMESPACE = "sheet_mirror"
+
+# 증분 조회 범위 마지막 열
+MIRROR_LAST_COL = "Z"
+
+
+class SheetMirror:
+    def __init__(self, sheet, spreadsheet_id, store=None):
+        self.sheet = sheet
+        self.key = f"{spreadsheet_id}/{sheet.title}"
+        self.store = store or get_mirror_store()
+        self.rows = []    # 1행부터 전체 값
+        self.synced = 0   # 시트에서 직접 읽어 확인한 행 수 (이후 행은 로컬 기록분)
+        self.index = {}   # 첫 열 값 -> 행 인덱스(0부터)
+
+    def _save(self):
+        self.store.set(MIRROR_NAMESPACE, self.key, {"rows": self.rows, "synced": self.synced})
+
+    def _reindex(self):
+        self.index = {row[0]: i for i, row in enumerate(self.rows) if row}
+
+    def sync(self):
+        """시트와 동기화 후 전체 행 반환"""
+        cached = self.store.get(MIRROR_NAMESPACE, self.key) or {}
+        rows = cached.get("rows", [])
+        synced = cached.get("synced", 0)
+
+        tail = None
+        if 0 < synced <= len(rows) and rows[synced - 1]:
+            try:
+                # 마지막 확인 행부터 끝까지 (첫 행은 일치 여부 확인용)
+                tail = self.sheet.get(f"A{synced}:{MIRROR_LAST_COL}")
+            except Exception:
+                tail = None
+
+        if tail and tail[0] and tail[0][0] == rows[synced - 1][0]:
+            rows = rows[:synced] + [list(row) for row in tail[1:]]
+        else:
+            try:
+                rows = self.sheet.get_all_values()
+            except Exception:
+                rows = []
+
+        self.rows = rows
+        self.synced = len(rows)
+        self._reindex()
+        self._save()
+        return self.rows
+
+    def find(self, value):
+        """첫 열이 value인 행 (없으면 None)"""
+        i = self.index.get(value)
+        return self.rows[i] if i is not None else None
+
+    def last(self):
+        return self.rows[-1] if self.rows else None
+
+    def record_append(self, new_rows):
+        """시트에 추가한 행을 로컬에 반영 (다음 동기화 때 시트 값으로 확인)"""
+        for row in new_rows:
+            row = ["" if value is None else str(value) for value in row]
+            if row:
+                self.index[row[0]] = len(self.rows)
+            self.rows.append(row)
+        self._save()
+
+    def record_insert(self, position, row):
+        """시트 중간에 삽입한 행을 로컬에 반영 (position: 0부터)"""
+        row = ["" if value is None else str(value) for value in row]
+        self.rows.insert(position, row)
+        if position < self.synced:
+            self.synced += 1
+        self._reindex()
+        self._save()
+
+    def invalidate(self):
+        """시트 구조 변경(헤더 삽입, 전체 삭제 등) 후 호출. 다음 동기화 때 전체 다시 읽음"""
+        self.rows = []
+        self.synced = 0
+        self.index = {}
+        self._save()
+
+
+_mirror_store = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror_store():
+    """미러 전용 저장소 (실행 상태와 분리해 워크플로 캐시 키를 날짜와 무관하게 유지)"""
+    global _mirror_store
+    with _mirror_lock:
+        if _mirror_store is None:
+            _mirror_store = StateStore(SHEET_MIRROR_FILE)
+        return _mirror_store
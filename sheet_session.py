@@ -0,0 +1,98 @@
+"""
+Google Sheet 쓰기 세션
+- 실행 1회 동안 여러 모니터의 행 추가 + 서식을 모아 spreadsheets.batchUpdate 1회로 반영
+- 스프레드시트 열기 / 시트탭 목록 조회는 스프레드시트당 1회
+- 행 추가는 appendCells 요청 (값과 서식을 한 요청에 포함, 행 번호 계산 불필요)
+- 값 변환은 append_row 기본값(RAW)과 동일: 숫자는 숫자, 나머지는 문자열 그대로
+"""
+
+import threading
+
+from clients import get_gsheet_client
+
+
+def _cell(value, fmt=None):
+    if value is None or value == "":
+        cell = {}
+    elif isinstance(value, bool):
+        cell = {"userEnteredValue": {"boolValue": value}}
+    elif isinstance(value, (int, float)):
+        cell = {"userEnteredValue": {"numberValue": value}}
+    else:
+        cell = {"userEnteredValue": {"stringValue": str(value)}}
+    if fmt:
+        cell["userEnteredFormat"] = fmt
+    return cell
+
+
+class SheetSession:
+    def __init__(self, gsheet_client, tag="[GSheet]"):
+        self.client = gsheet_client
+        self.tag = tag
+        self.lock = threading.Lock()
+        self.spreadsheets = {}  # spreadsheet_id -> Spreadsheet
+        self.worksheets = {}    # spreadsheet_id -> {시트탭 이름: Worksheet}
+        self.pending = {}       # spreadsheet_id -> (Spreadsheet, [batchUpdate 요청])
+
+    def _open(self, spreadsheet_id):
+        if spreadsheet_id not in self.spreadsheets:
+            spreadsheet = self.client.open_by_key(spreadsheet_id)
+            self.spreadsheets[spreadsheet_id] = spreadsheet
+            self.worksheets[spreadsheet_id] = {ws.title: ws for ws in spreadsheet.worksheets()}
+        return self.spreadsheets[spreadsheet_id]
+
+    def worksheet(self, spreadsheet_id, title, rows=1000, cols=10, create=True):
+        """시트탭 조회 (없으면 create=True일 때 생성, 아니면 None)"""
+        with self.lock:
+            spreadsheet = self._open(spreadsheet_id)
+            sheets = self.worksheets[spreadsheet_id]
+            if title not in sheets:
+                if not create:
+                    return None
+                sheets[title] = spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+                print(f"{self.tag} '{title}' 시트탭 생성 완료")
+            return sheets[title]
+
+    def append(self, sheet, rows, formats=None):
+        """행 추가 예약 (commit 때 반영)
+
+        Args:
+            sheet: worksheet()로 얻은 시트탭
+            rows: 값 목록의 목록
+            formats: {열 번호(0부터): userEnteredFormat} - 해당 열 셀에 서식 적용
+        """
+        formats = formats or {}
+        request = {
+            "appendCells": {
+                "sheetId": sheet.id,
+                "rows": [
+                    {"values": [_cell(value, formats.get(col)) for col, value in enumerate(row)]}
+                    for row in rows
+                ],
+                "fields": "userEnteredValue,userEnteredFormat",
+            }
+        }
+        with self.lock:
+            spreadsheet = sheet.spreadsheet
+            self.pending.setdefault(spreadsheet.id, (spreadsheet, []))[1].append(request)
+
+    def commit(self):
+        """예약된 요청을 스프레드시트별 batchUpdate 1회로 반영. 전부 성공 시 True"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        ok = True
+        for spreadsheet, requests in pending.values():
+            try:
+                spreadsheet.batch_update({"requests": requests})
+                print(f"{self.tag} 시트 일괄 반영 완료 (요청 {len(requests)}건)")
+            except Exception as e:
+                print(f"{self.tag} 시트 일괄 반영 실패: {e}")
+                ok = False
+        return ok
+
+
+def open_session(tag="[GSheet]"):
+    """단독 실행용 세션 생성. 인증 정보/라이브러리가 없으면 None"""
+    client = get_gsheet_client(tag)
+    return SheetSession(client, tag) if client else None
@@ -0,0 +1,125 @@
+"""
+Slack 메시지 비동기 발송기
+- 백그라운드 스레드 + 큐로 발송 (조회/판단 루프를 막지 않음)
+- 같은 체크 주기에 쌓인 알림은 메시지 1건으로 합쳐 발송
+- 429 (rate limit) 응답 시 Retry-After 만큼 대기 후 재시도
+"""
+
+import queue
+import threading
+import time
+
+# 발송 재시도 최대 횟수 (429 응답 기준)
+MAX_RETRIES = 5
+
+# Retry-After 헤더가 없을 때 대기 (초)
+DEFAULT_RETRY_AFTER = 1
+
+
+def _retry_after(response):
+    headers = response.headers or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class SlackDispatcher:
+    def __init__(self, client, channel, tag="[Slack]"):
+        self.client = client
+        self.channel = channel
+        self.tag = tag
+        self.queue = queue.Queue()
+        self.pending = []  # 현재 주기에 쌓인 (text, attachments)
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def send(self, text, attachments=None):
+        """즉시 발송 (호출 스레드에서 실행, rate limit 재시도 포함). 성공 시 True"""
+        from slack_sdk.errors import SlackApiError
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                kwargs = {"channel": self.channel, "text": text}
+                if attachments:
+                    kwargs["attachments"] = attachments
+                self.client.chat_postMessage(**kwargs)
+                return True
+            except SlackApiError as e:
+                if e.response.status_code == 429 and attempt < MAX_RETRIES - 1:
+                    wait = _retry_after(e.response)
+                    print(f"{self.tag} rate limit - {wait}초 후 재시도")
+                    time.sleep(wait)
+                    continue
+                print(f"[Slack 오류] {e.response['error']}")
+                return False
+            except Exception as e:
+                # 연결 오류/타임아웃 등 (발송 스레드가 죽지 않도록 여기서 처리)
+                print(f"[Slack 오류] {e}")
+                return False
+        return False
+
+    def add(self, text, attachments=None):
+        """현재 주기 알림에 추가 (flush 시 한 메시지로 합쳐 발송)"""
+        with self.lock:
+            self.pending.append((text, attachments or []))
+
+    def flush(self):
+        """현재 주기 알림을 합쳐 발송 큐에 넣음 (발송 완료를 기다리지 않음)"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return
+
+        text = "\n\n".join(item_text for item_text, _ in pending)
+        attachments = [attachment for _, item_attachments in pending for attachment in item_attachments]
+        self.post(text, attachments, count=len(pending))
+
+    def post(self, text, attachments=None, count=1):
+        """메시지를 발송 큐에 넣음 (백그라운드 발송)"""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._worker, name="slack-dispatcher", daemon=True)
+                self.thread.start()
+        self.queue.put((text, attachments, count))
+
+    def _deliver(self, item):
+        text, attachments, count = item
+        try:
+            if self.send(text, attachments):
+                print(f"{self.tag} 알림 발송 완료 ({count}건)")
+        except Exception as e:
+            print(f"[Slack 오류] {e}")
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(item)
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """남은 알림 발송 후 종료 (프로세스 종료 전 호출)"""
+        self.flush()
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None and thread.is_alive():
+            self.queue.put(None)
+            thread.join()
+
+        # 발송 스레드가 없거나 비정상 종료됐으면 남은 알림을 현재 스레드에서 발송
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if item is not None:
+                    self._deliver(item)
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,131 @@
+"""
+실행 상태 저장소 (SQLite, WAL 모드)
+- 알림 중복 방지 키, 관세청 확인 게시물, 작업별 마지막 실행일 등을 한 곳에 저장
+- (namespace, key) 단위 upsert, 만료 시각(TTL) 지난 항목 자동 정리
+- 여러 작업/프로세스가 동시에 접근해도 안전 (WAL + busy timeout)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+STATE_DB_FILE = os.environ.get("STATE_DB_PATH", "state.db")
+
+# 다른 프로세스가 쓰는 중일 때 대기 시간 (초)
+BUSY_TIMEOUT = 30
+
+# 작업별 마지막 실행일 namespace (key: 작업 이름, value: "YYYY-MM-DD")
+LAST_RUN_NAMESPACE = "last_run"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_state_expires ON state (expires_at);
+"""
+
+
+class StateStore:
+    def __init__(self, path=STATE_DB_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def get(self, namespace, key, default=None):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace, key, value, ttl=None):
+        self.set_many(namespace, {key: value}, ttl=ttl)
+
+    def set_many(self, namespace, mapping, ttl=None):
+        """여러 키 upsert (한 트랜잭션)
+
+        Args:
+            ttl: 만료까지 초. None이면 만료 없음
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        rows = [
+            (namespace, key, json.dumps(value, ensure_ascii=False), expires_at, now)
+            for key, value in mapping.items()
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO state (namespace, key, value, expires_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET "
+                "value = excluded.value, expires_at = excluded.expires_at, updated_at = excluded.updated_at",
+                rows,
+            )
+
+    def items(self, namespace):
+        """namespace 내 만료되지 않은 전체 항목 {key: value}"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, value FROM state WHERE namespace = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time()),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def keys(self, namespace):
+        """namespace 내 만료되지 않은 key 집합 (값을 읽지 않음)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key FROM state WHERE namespace = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time()),
+            ).fetchall()
+        return {key for key, in rows}
+
+    def delete(self, namespace, key):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def purge_expired(self):
+        """만료 항목 삭제. 삭제 건수 반환"""
+        with self.lock, self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+        return cur.rowcount
+
+    def checkpoint(self):
+        """WAL 내용을 DB 파일에 반영 (파일 단위로 캐시 저장하기 전 호출)"""
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.checkpoint()
+        with self.lock:
+            self.conn.close()
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_state_store():
+    """프로세스 공용 상태 저장소"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = StateStore()
+        return _default_store
@@ -5,14 +5,12 @@
 
 import time
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 from zoneinfo import ZoneInfo
-import requests
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-from pykrx import stock
-from holiday_checker import is_korean_holiday
+from holiday_checker import is_trading_day
+from market_data import QuoteSnapshot, fetch_ticker_quote, fetch_ticker_quotes
+from slack_dispatcher import SlackDispatcher
 
 KST = ZoneInfo("Asia/Seoul")
 
@@ -38,49 +36,41 @@ SLACK_CHANNEL = os.environ.get("SLACK_CHANNEL", "#stock_management")
 
 
 class StockMonitor:
-    def __init__(self):
-        self.slack_client = None
-        if SLACK_BOT_TOKEN:
+    def __init__(self, snapshot=None, slack_client=None, pnl=None):
+        self.slack_client = slack_client
+        if self.slack_client is None and SLACK_BOT_TOKEN:
+            from slack_sdk import WebClient
             self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
         self.alerted_stocks = {}  # 이미 알림 보낸 종목 추적 (종목_날짜: "up" 또는 "down")
         self.daily_summary_sent = None  # 일일 요약 발송 날짜
+        self.snapshot = snapshot  # 공유 시세 스냅샷 (QuoteSnapshot, 없으면 호출마다 조회)
+        self.dispatcher = SlackDispatcher(self.slack_client, SLACK_CHANNEL) if self.slack_client else None
+        self.pnl = pnl  # 장중 포트폴리오 손익 (IntradayPnL, 없으면 추적 안 함)
 
     def get_stock_data(self, ticker: str) -> Optional[dict]:
-        """주식 데이터 조회 (pykrx 사용)"""
-        try:
-            # 오늘 날짜와 7일 전 날짜 (주말/공휴일 고려), KST 기준
-            today = datetime.now(KST)
-            start_date = (today - timedelta(days=7)).strftime("%Y%m%d")
-            end_date = today.strftime("%Y%m%d")
-
-            # OHLCV 데이터 조회
-            df = stock.get_market_ohlcv(start_date, end_date, ticker)
-
-            if df.empty or len(df) < 1:
-                print(f"[오류] {ticker}: 데이터 없음")
-                return None
-
-            # 최근 거래일 데이터
-            current_price = df['종가'].iloc[-1]
-
-            # 전일 종가 계산
-            if len(df) >= 2:
-                prev_close = df['종가'].iloc[-2]
-            else:
-                prev_close = df['시가'].iloc[-1]
-
-            change_pct = ((current_price - prev_close) / prev_close) * 100
-
-            return {
-                "ticker": ticker,
-                "name": STOCK_LIST.get(ticker, ticker),
-                "current_price": current_price,
-                "prev_close": prev_close,
-                "change_pct": change_pct,
-            }
-        except Exception as e:
-            print(f"[오류] {ticker} 데이터 조회 실패: {e}")
-            return None
+        """주식 데이터 조회 (pykrx 일봉 캐시 사용)"""
+        return fetch_ticker_quote(ticker, STOCK_LIST.get(ticker, ticker))
+
+    def get_bulk_stock_data(self, tickers=None) -> dict:
+        """관심 종목 일괄 조회 (공유 스냅샷 우선, 스냅샷 대상이 아닌 종목만 개별 조회).
+
+        Returns:
+            {종목코드: get_stock_data()와 같은 형식의 dict}
+        """
+        tickers = list(tickers or STOCK_LIST.keys())
+        snapshot = self.snapshot or QuoteSnapshot(tickers, STOCK_LIST)
+        snapshot_quotes = snapshot.quotes()
+
+        extra = [ticker for ticker in tickers if ticker not in snapshot.tickers]
+        extra_quotes = fetch_ticker_quotes(extra, STOCK_LIST) if extra else {}
+
+        quotes = {}
+        for ticker in tickers:
+            stock_data = snapshot_quotes.get(ticker) or extra_quotes.get(ticker)
+            if stock_data:
+                quotes[ticker] = stock_data
+
+        return quotes
 
     def send_slack_alert(self, stock_data: dict):
         """Slack 알림 발송"""
@@ -94,21 +84,17 @@ class StockMonitor:
             f"변동률: *{stock_data['change_pct']:+.2f}%*"
         )
 
-        if self.slack_client:
-            try:
-                self.slack_client.chat_postMessage(
-                    channel=SLACK_CHANNEL,
-                    text=message,
-                    attachments=[
-                        {
-                            "color": color,
-                            "text": f"변동률 {THRESHOLD}% 초과 알림",
-                        }
-                    ],
-                )
-                print(f"[Slack] 알림 발송 완료: {stock_data['name']}")
-            except SlackApiError as e:
-                print(f"[Slack 오류] {e.response['error']}")
+        if self.dispatcher:
+            # 같은 체크 주기의 알림은 check_stocks 종료 시 1건으로 합쳐 발송
+            self.dispatcher.add(
+                message,
+                attachments=[
+                    {
+                        "color": color,
+                        "text": f"{stock_data['name']} 변동률 {THRESHOLD}% 초과 알림",
+                    }
+                ],
+            )
         else:
             # Slack 토큰 없으면 콘솔 출력
             print(f"\n{'='*50}")
@@ -116,15 +102,41 @@ class StockMonitor:
             print(message.replace('*', ''))
             print(f"{'='*50}\n")
 
+    def send_pnl_alert(self, pnl: dict):
+        """장중 포트폴리오 손익 알림 발송"""
+        emoji = "📈" if pnl["change_pct"] > 0 else "📉"
+        color = "#36a64f" if pnl["change_pct"] > 0 else "#ff0000"
+
+        message = (
+            f"{emoji} *포트폴리오 장중 손익* ({pnl['date']})\n"
+            f"평가금액: {pnl['total']:,}원\n"
+            f"전일대비: *{pnl['pnl']:+,}원 ({pnl['change_pct']:+.2f}%)*\n"
+            f"장중 고가/저가: {pnl['high']:,}원 / {pnl['low']:,}원\n"
+            f"고점 대비: {pnl['drawdown'] * 100:+.2f}% (장중 최대 {pnl['max_drawdown'] * 100:+.2f}%)"
+        )
+
+        if self.dispatcher:
+            # 종목 알림과 함께 check_stocks 종료 시 1건으로 합쳐 발송
+            self.dispatcher.add(
+                message,
+                attachments=[
+                    {
+                        "color": color,
+                        "text": f"포트폴리오 변동률 {self.pnl.threshold}% 단위 초과 알림",
+                    }
+                ],
+            )
+        else:
+            print(f"\n{'='*50}")
+            print("🚨 포트폴리오 손익 알림 🚨")
+            print(message.replace('*', ''))
+            print(f"{'='*50}\n")
+
     def send_daily_summary(self) -> bool:
         """일일 종목 요약 발송. 성공 시 True 반환."""
         print(f"\n[{datetime.now(KST).strftime('%H:%M:%S')}] 일일 요약 생성 중...")
 
-        results = []
-        for ticker in STOCK_LIST.keys():
-            stock_data = self.get_stock_data(ticker)
-            if stock_data:
-                results.append(stock_data)
+        results = list(self.get_bulk_stock_data().values())
 
         if not results:
             print("[오류] 요약 데이터 없음 - 재시도 필요")
@@ -151,17 +163,11 @@ class StockMonitor:
 
         message = "\n".join(lines)
 
-        if self.slack_client:
-            try:
-                self.slack_client.chat_postMessage(
-                    channel=SLACK_CHANNEL,
-                    text=message,
-                )
+        if self.dispatcher:
+            if self.dispatcher.send(message):
                 print("[Slack] 일일 요약 발송 완료")
                 return True
-            except SlackApiError as e:
-                print(f"[Slack 오류] {e.response['error']}")
-                return False
+            return False
         else:
             print(f"\n{'='*50}")
             print(message.replace('*', ''))
@@ -174,8 +180,10 @@ class StockMonitor:
 
         print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 종목 체크 중...")
 
+        quotes = self.get_bulk_stock_data()
+
         for ticker in STOCK_LIST.keys():
-            stock_data = self.get_stock_data(ticker)
+            stock_data = quotes.get(ticker)
 
             if stock_data is None:
                 continue
@@ -195,16 +203,32 @@ class StockMonitor:
                     self.send_slack_alert(stock_data)
                     self.alerted_stocks[alert_key] = current_direction
 
+        # 장중 포트폴리오 손익 (이번 주기 시세 재사용, 추가 조회 없음)
+        if self.pnl:
+            pnl = self.pnl.update(quotes)
+            if pnl:
+                print(
+                    f"  포트폴리오: {pnl['total']:,}원 ({pnl['change_pct']:+.2f}%) "
+                    f"고가 {pnl['high']:,} / 저가 {pnl['low']:,} / 고점 대비 {pnl['drawdown'] * 100:+.2f}%"
+                )
+                if pnl["alert"]:
+                    self.send_pnl_alert(pnl)
+
+        # 이번 주기 알림 일괄 발송 (백그라운드)
+        if self.dispatcher:
+            self.dispatcher.flush()
+
+    def close(self):
+        """발송 대기 중인 Slack 알림 처리 후 종료"""
+        if self.dispatcher:
+            self.dispatcher.close()
+
     def is_market_hours(self) -> bool:
-        """한국 주식시장 운영 시간 확인 (09:00 ~ 15:30, 공휴일 제외)"""
+        """한국 주식시장 운영 시간 확인 (09:00 ~ 15:30, 휴장일 제외)"""
         now = datetime.now()
 
-        # 주말 제외
-        if now.weekday() >= 5:
-            return False
-
-        # 공휴일 제외 (임시공휴일 포함)
-        if is_korean_holiday(now.date()):
+        # 주말/공휴일/KRX 휴장일 제외 (임시공휴일 포함)
+        if not is_trading_day(now.date()):
             return False
 
         current_time = now.hour * 100 + now.minute
@@ -242,6 +266,7 @@ class StockMonitor:
 
             except KeyboardInterrupt:
                 print("\n모니터링 종료")
+                self.close()
                 break
             except Exception as e:
                 print(f"[오류] {e}")
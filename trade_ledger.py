@@ -0,0 +1,150 @@
+"""
+매매 원장 기반 보유수량
+- 원장 파일(CSV)의 매수/매도/액면분할 기록으로 날짜별 보유수량 계산
+- 날짜 x 종목 격자에 거래를 배치한 뒤 누적합(cumsum) 1회로 전 기간 보유수량 산출
+- 여러 계좌를 (계좌, 날짜, 종목) 배열로 한 번에 계산
+
+원장 형식 (첫 행 헤더, '#'으로 시작하는 행은 주석):
+    date,account,ticker,action,quantity
+    2025-01-02,연금,091160,buy,12188
+    2025-03-10,연금,091160,sell,1000
+    2025-06-01,,005930,split,50
+
+    action: buy / sell / split (split의 quantity는 분할 비율, 예: 1주 -> 50주면 50)
+    account: 생략 시 "default". split은 계좌와 무관하게 전 계좌에 적용
+"""
+
+import csv
+import os
+from datetime import date
+
+import numpy as np
+
+LEDGER_FILE = os.environ.get("PORTFOLIO_LEDGER_PATH", "portfolio_ledger.csv")
+
+DEFAULT_ACCOUNT = "default"
+
+ACTIONS = ("buy", "sell", "split")
+
+
+def _parse_date(value):
+    value = value.strip()
+    if len(value) == 8 and value.isdigit():
+        value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return date.fromisoformat(value).isoformat()
+
+
+class TradeLedger:
+    def __init__(self, trades):
+        """
+        Args:
+            trades: [{"date": "YYYY-MM-DD", "account", "ticker", "action", "quantity"}]
+                    (split의 account는 None)
+        """
+        self.trades = sorted(trades, key=lambda t: t["date"])
+        accounts = [t["account"] for t in self.trades if t["account"] is not None]
+        self.accounts = list(dict.fromkeys(accounts)) or [DEFAULT_ACCOUNT]
+        self.tickers = list(dict.fromkeys(t["ticker"] for t in self.trades))
+
+    @classmethod
+    def load(cls, path=LEDGER_FILE):
+        """원장 파일 읽기. 형식 오류 시 ValueError (행 번호 포함)"""
+        trades = []
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                first = (row.get("date") or "").strip()
+                if not first or first.startswith("#"):
+                    continue
+                try:
+                    action = row["action"].strip().lower()
+                    if action not in ACTIONS:
+                        raise ValueError(f"알 수 없는 action: {row['action']}")
+                    quantity = float(row["quantity"])
+                    if quantity <= 0:
+                        raise ValueError(f"quantity는 0보다 커야 함: {row['quantity']}")
+                    account = (row.get("account") or "").strip() or DEFAULT_ACCOUNT
+                    trades.append({
+                        "date": _parse_date(row["date"]),
+                        "account": None if action == "split" else account,
+                        "ticker": row["ticker"].strip(),
+                        "action": action,
+                        "quantity": quantity,
+                    })
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"원장 {path} {reader.line_num}행 형식 오류: {e}") from e
+        return cls(trades)
+
+    def holdings(self, dates, tickers):
+        """날짜별 보유수량 일괄 계산.
+
+        거래/분할은 해당 날짜 이후 첫 격자 날짜부터 반영 (격자 이전 거래는 첫 날짜에 포함).
+        같은 날 분할과 거래가 있으면 분할 먼저 적용 (거래 수량은 분할 후 기준).
+        분할은 누적 분할배수 F로 처리: 거래 수량을 거래일 기준 F로 나눠 누적한 뒤
+        날짜별 F를 곱함 -> 분할 전 보유분만 분할 비율만큼 늘어남.
+
+        Args:
+            dates: "YYYY-MM-DD" 오름차순 목록
+            tickers: 열 순서 (원장에 없는 종목은 0)
+
+        Returns:
+            (계좌 수, 날짜 수, 종목 수) float64 배열 (계좌 순서는 self.accounts)
+        """
+        grid = np.asarray(dates, dtype="datetime64[D]")
+        ticker_index = {t: j for j, t in enumerate(tickers)}
+        account_index = {a: i for i, a in enumerate(self.accounts)}
+        n_dates, n_tickers = len(dates), len(tickers)
+
+        trades = [t for t in self.trades if t["ticker"] in ticker_index]
+        splits = [t for t in trades if t["action"] == "split"]
+        moves = [t for t in trades if t["action"] != "split"]
+
+        # 날짜별 누적 분할배수 (날짜 수, 종목 수)
+        ratios = np.ones((n_dates, n_tickers))
+        if splits and n_dates:
+            rows = np.searchsorted(grid, np.asarray([t["date"] for t in splits], dtype="datetime64[D]"))
+            cols = np.asarray([ticker_index[t["ticker"]] for t in splits], dtype=np.intp)
+            factors = np.asarray([t["quantity"] for t in splits])
+            inside = rows < n_dates
+            np.multiply.at(ratios, (rows[inside], cols[inside]), factors[inside])
+        split_factor = np.cumprod(ratios, axis=0)
+
+        deltas = np.zeros((len(self.accounts), n_dates, n_tickers))
+        if moves and n_dates:
+            move_dates = np.asarray([t["date"] for t in moves], dtype="datetime64[D]")
+            rows = np.searchsorted(grid, move_dates)
+            cols = np.asarray([ticker_index[t["ticker"]] for t in moves], dtype=np.intp)
+            accts = np.asarray([account_index[t["account"]] for t in moves], dtype=np.intp)
+            signs = np.asarray([1.0 if t["action"] == "buy" else -1.0 for t in moves])
+            quantities = signs * np.asarray([t["quantity"] for t in moves])
+
+            # 거래일 시점의 누적 분할배수 (격자와 무관하게 실제 날짜 기준)
+            trade_factor = np.ones(len(moves))
+            if splits:
+                split_dates = np.asarray([t["date"] for t in splits], dtype="datetime64[D]")
+                split_cols = np.asarray([ticker_index[t["ticker"]] for t in splits], dtype=np.intp)
+                factors = np.asarray([t["quantity"] for t in splits])
+                # (거래 수, 분할 수): 같은 종목 + 분할일 <= 거래일
+                applies = (split_cols[None, :] == cols[:, None]) & (split_dates[None, :] <= move_dates[:, None])
+                trade_factor = np.prod(np.where(applies, factors[None, :], 1.0), axis=1)
+
+            inside = rows < n_dates
+            np.add.at(
+                deltas,
+                (accts[inside], rows[inside], cols[inside]),
+                quantities[inside] / trade_factor[inside],
+            )
+
+        return np.rint(np.cumsum(deltas, axis=1) * split_factor[None, :, :])
+
+    def positions_on(self, date_str, tickers):
+        """특정 날짜 전 계좌 합산 보유수량 {종목코드: 수량(int)}"""
+        shares = self.holdings([date_str], tickers).sum(axis=0)[0]
+        return {ticker: int(shares[j]) for j, ticker in enumerate(tickers)}
+
+
+def load_ledger(path=LEDGER_FILE):
+    """원장 파일이 있으면 TradeLedger, 없으면 None"""
+    if not os.path.exists(path):
+        return None
+    return TradeLedger.load(path)